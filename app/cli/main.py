@@ -7,7 +7,7 @@ import sys
 import logging
 from typing import Optional
 from core.ingestion import IngestionEngine
-from core.config import ConfigManager
+from core.config import get_config_manager
 from core.knowledge import KnowledgeEngine
 
 # Configure logging
@@ -116,7 +116,7 @@ def run_sources():
     print("📁 Configured Data Sources:\n")
     
     try:
-        config = ConfigManager()
+        config = get_config_manager()
         
         if not config.sources:
             print("No sources configured. Edit config/sources.json to add sources.")
@@ -195,7 +195,7 @@ def run_status():
         print(f"   Collection: {stats['collection_name']}")
         
         # Check configuration
-        config = ConfigManager()
+        config = get_config_manager()
         enabled_sources = []
         for source_list in config.sources.values():
             enabled_sources.extend([s for s in source_list if s.enabled])
@@ -9,7 +9,7 @@ This package provides comprehensive configuration management capabilities:
 """
 
 from .models import SourceConfig, Settings, AutoDiscoveryConfig, IngestionConfig, StorageConfig
-from .manager import ConfigManager
+from .manager import ConfigManager, get_config_manager
 from .sources import SourceManager
 from .persistence import ConfigPersistence
 
@@ -20,6 +20,7 @@ __all__ = [
     'IngestionConfig',
     'StorageConfig',
     'ConfigManager',
+    'get_config_manager',
     'SourceManager',
     'ConfigPersistence'
 ]
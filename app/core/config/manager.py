@@ -5,13 +5,15 @@ This module coordinates source management, persistence, and settings
 to provide a unified interface for configuration management.
 """
 
+import functools
 import logging
+import os
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
 from .models import SourceConfig, Settings
 from .sources import SourceManager
-from .persistence import ConfigPersistence
+from .persistence import ConfigPersistence, DEFAULT_CONFIG_PATH
 
 logger = logging.getLogger(__name__)
 
@@ -309,3 +311,33 @@ class ConfigManager:
             },
             "validation": self.validate_config()
         }
+
+
+def get_config_manager(config_path: str = None) -> ConfigManager:
+    """
+    Get a shared configuration manager for a configuration file.
+    
+    Managers are cached per file and modification time, so repeated callers
+    (CLI commands, engine instances) reuse one parsed configuration until the
+    file changes on disk.
+    
+    Args:
+        config_path: Path to configuration file (defaults to config/sources.json)
+        
+    Returns:
+        Configuration manager for the file
+    """
+    path = os.path.abspath(config_path if config_path is not None else DEFAULT_CONFIG_PATH)
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        # Not created yet: this manager writes the default config, and later
+        # calls cache against the new file
+        return ConfigManager(path)
+    return _cached_config_manager(path, mtime_ns)
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_config_manager(config_path: str, mtime_ns: int) -> ConfigManager:
+    """Create the manager for get_config_manager; mtime_ns is only part of the cache key."""
+    return ConfigManager(config_path)
@@ -63,7 +63,7 @@ class IngestionConfig:
 class StorageConfig:
     """Configuration for data storage and persistence."""
     data_directory: str = "/app/data"
-    file_tracker_path: str = "/app/data/file_tracker.pkl"
+    file_tracker_path: str = "/app/data/file_tracker.db"
     backup_enabled: bool = True
     backup_interval_hours: int = 24
     max_backup_files: int = 10
@@ -14,6 +14,9 @@ from .models import SourceConfig, Settings
 
 logger = logging.getLogger(__name__)
 
+# Configuration file used when no path is given
+DEFAULT_CONFIG_PATH = Path("./config/sources.json")
+
 
 class ConfigPersistence:
     """Handles configuration file persistence and management."""
@@ -26,7 +29,7 @@ class ConfigPersistence:
             config_path: Path to configuration file
         """
         if config_path is None:
-            config_path = Path("./config/sources.json")
+            config_path = DEFAULT_CONFIG_PATH
         
         self.config_path = Path(config_path)
         self.config_data = {}
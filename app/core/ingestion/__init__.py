@@ -13,7 +13,8 @@ from .parallel import ParallelProcessor
 from .discovery import ProjectDiscovery
 from .engine import IngestionEngine
 from .document_parser import DocumentParser
-from .chroma_storage import ChromaStorage
+from .chroma_storage import ChromaStorage, ChunkBuffer
+from .models import AutoSource, ChunkBatch, FileMetadata, TrackerRecord
 
 __all__ = [
     'FileTracker',
@@ -21,5 +22,10 @@ __all__ = [
     'ProjectDiscovery',
     'IngestionEngine',
     'DocumentParser',
-    'ChromaStorage'
+    'ChromaStorage',
+    'ChunkBuffer',
+    'AutoSource',
+    'ChunkBatch',
+    'FileMetadata',
+    'TrackerRecord'
 ]
@@ -5,19 +5,69 @@ This module manages the storage of parsed document chunks in Chroma DB,
 including embedding generation and metadata storage.
 """
 
+import hashlib
 import logging
+import os
+import threading
 from typing import List, Dict, Any, Optional
 from pathlib import Path
+import numpy as np
 import chromadb
 from chromadb.config import Settings
+from chromadb.utils import embedding_functions
+
+from .models import ChunkBatch
 
 logger = logging.getLogger(__name__)
 
+# Bytes of content digest embedded in each chunk ID (16 hex characters)
+CHUNK_ID_DIGEST_SIZE = 8
+
+# Number of documents embedded per call to the embedding function
+EMBEDDING_BATCH_SIZE = 64
+
+
+def content_digest(content: str) -> str:
+    """
+    Return a short hex digest of chunk content for use in chunk IDs.
+    
+    Unlike the builtin hash(), this is stable across processes and wide
+    enough that collisions between chunks are not a practical concern.
+    
+    Args:
+        content: Chunk text
+        
+    Returns:
+        16-character hex digest
+    """
+    return hashlib.blake2b(
+        content.encode('utf-8', 'surrogatepass'),
+        digest_size=CHUNK_ID_DIGEST_SIZE
+    ).hexdigest()
+
+
+def default_persist_path() -> Optional[str]:
+    """
+    Local Chroma data directory to store chunks in-process, or None to use the server.
+    
+    Uses the CHROMA_PERSIST_PATH environment variable. This is opt-in, since
+    an in-process PersistentClient must not share its directory with a
+    running Chroma server.
+    """
+    return os.environ.get("CHROMA_PERSIST_PATH") or None
+
 
 class ChromaStorage:
     """Manages storage of document chunks in Chroma DB."""
     
-    def __init__(self, host: str = "chroma", port: int = 8000, collection_name: str = "stackguide_docs"):
+    def __init__(
+        self, 
+        host: str = "chroma", 
+        port: int = 8000, 
+        collection_name: str = "stackguide_docs",
+        embedding_function: Optional[Any] = None,
+        persist_path: Optional[str] = None
+    ):
         """
         Initialize the Chroma storage manager.
         
@@ -25,10 +75,18 @@ class ChromaStorage:
             host: Chroma DB host
             port: Chroma DB port
             collection_name: Name of the collection to use
+            embedding_function: Embedding function used for documents
+                (defaults to Chroma's default embedding model)
+            persist_path: Local Chroma data directory. When set, an in-process
+                PersistentClient is used instead of the HTTP client, avoiding
+                per-insert HTTP serialization for bulk loads. Only use this when
+                no Chroma server is running against the same directory.
         """
         self.host = host
         self.port = port
+        self.persist_path = persist_path
         self.collection_name = collection_name
+        self.embedding_function = embedding_function or embedding_functions.DefaultEmbeddingFunction()
         self.client = None
         self.collection = None
         self._connect()
@@ -37,35 +95,40 @@ class ChromaStorage:
         """Connect to Chroma DB."""
         try:
             # Connect to Chroma DB
-            self.client = chromadb.HttpClient(
-                host=self.host,
-                port=self.port,
-                settings=Settings(anonymized_telemetry=False)
+            if self.persist_path:
+                self.client = chromadb.PersistentClient(
+                    path=self.persist_path,
+                    settings=Settings(anonymized_telemetry=False)
+                )
+                logger.info(f"Using local Chroma data directory: {self.persist_path}")
+            else:
+                self.client = chromadb.HttpClient(
+                    host=self.host,
+                    port=self.port,
+                    settings=Settings(anonymized_telemetry=False)
+                )
+            
+            # Get or create collection in a single idempotent call
+            self.collection = self.client.get_or_create_collection(
+                name=self.collection_name,
+                metadata={"description": "StackGuide document chunks"},
+                embedding_function=self.embedding_function
             )
+            logger.info(f"Connected to collection: {self.collection_name}")
             
-            # Get or create collection
-            try:
-                self.collection = self.client.get_collection(name=self.collection_name)
-                logger.info(f"Connected to existing collection: {self.collection_name}")
-            except Exception:
-                # Collection doesn't exist, create it
-                self.collection = self.client.create_collection(
-                    name=self.collection_name,
-                    metadata={"description": "StackGuide document chunks"}
-                )
-                logger.info(f"Created new collection: {self.collection_name}")
-                
         except Exception as e:
             logger.error(f"Failed to connect to Chroma DB: {e}")
             raise
     
-    def store_chunks(self, chunks: List[Dict[str, Any]], source_name: str = None) -> int:
+    def store_chunks(self, chunks: List[Dict[str, Any]], source_name: str = None, start_index: int = 0) -> int:
         """
         Store document chunks in Chroma DB.
         
         Args:
             chunks: List of chunks to store
             source_name: Name of the source these chunks came from
+            start_index: Index of the first chunk within its file, used when a
+                file's chunks are stored across several batches
             
         Returns:
             Number of chunks successfully stored
@@ -74,40 +137,101 @@ class ChromaStorage:
             return 0
         
         try:
-            # Prepare data for Chroma DB
-            documents = []
-            metadatas = []
-            ids = []
-            
-            for i, chunk in enumerate(chunks):
-                # Generate unique ID for this chunk
-                chunk_id = f"{chunk['metadata']['file_path']}_{i}_{hash(chunk['content']) % 1000000}"
-                
-                # Prepare metadata
-                metadata = chunk['metadata'].copy()
-                if source_name:
-                    metadata['source_name'] = source_name
-                metadata['chunk_index'] = i
-                
-                # Add to lists
-                documents.append(chunk['content'])
-                metadatas.append(metadata)
-                ids.append(chunk_id)
-            
-            # Store in Chroma DB
+            batch = self.prepare_chunks(chunks, source_name, start_index)
+        except Exception as e:
+            logger.error(f"Error preparing chunks for Chroma DB: {e}")
+            return 0
+        
+        return self.add_batch(batch)
+    
+    def prepare_chunks(
+        self, 
+        chunks: List[Dict[str, Any]], 
+        source_name: str = None, 
+        start_index: int = 0
+    ) -> ChunkBatch:
+        """
+        Convert parsed chunks into a ChunkBatch in a single pass.
+        
+        Args:
+            chunks: List of chunks to convert
+            source_name: Name of the source these chunks came from
+            start_index: Index of the first chunk within its file
+            
+        Returns:
+            ChunkBatch holding the IDs, documents and metadata
+        """
+        batch = ChunkBatch()
+        append = batch.append
+        
+        for i, chunk in enumerate(chunks, start_index):
+            file_meta = chunk['file_metadata']
+            content = chunk['content']
+            
+            # Generate a stable, unique ID for this chunk from its content digest
+            chunk_id = f"{file_meta.file_path}_{i}_{content_digest(content)}"
+            
+            # Merge shared file-level metadata with chunk-specific fields
+            metadata = file_meta.as_dict()
+            metadata.update(chunk['metadata'])
+            if source_name:
+                metadata['source_name'] = source_name
+            metadata['chunk_index'] = i
+            
+            append(chunk_id, content, metadata)
+        
+        return batch
+    
+    def add_batch(self, batch: ChunkBatch) -> int:
+        """
+        Store an already-prepared chunk batch in a single Chroma insert.
+        
+        Args:
+            batch: Chunk batch to store
+            
+        Returns:
+            Number of chunks successfully stored
+        """
+        if not batch:
+            return 0
+        
+        try:
+            # Embed client-side in fixed-size batches and hand Chroma the vectors
+            embeddings = self._embed_documents(batch.documents)
+            
             self.collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
+                documents=batch.documents,
+                embeddings=embeddings,
+                metadatas=batch.metadatas,
+                ids=batch.ids
             )
             
-            logger.info(f"Stored {len(chunks)} chunks in Chroma DB")
-            return len(chunks)
+            logger.info(f"Stored {len(batch)} chunks in Chroma DB")
+            return len(batch)
             
         except Exception as e:
             logger.error(f"Error storing chunks in Chroma DB: {e}")
             return 0
     
+    def _embed_documents(self, documents: List[str]) -> np.ndarray:
+        """
+        Embed documents in batches of EMBEDDING_BATCH_SIZE.
+        
+        Args:
+            documents: Document texts to embed
+            
+        Returns:
+            Contiguous float32 array with one embedding row per document, in order
+        """
+        blocks = [
+            np.asarray(
+                self.embedding_function(documents[start:start + EMBEDDING_BATCH_SIZE]),
+                dtype=np.float32
+            )
+            for start in range(0, len(documents), EMBEDDING_BATCH_SIZE)
+        ]
+        return np.concatenate(blocks)
+    
     def get_collection_stats(self) -> Dict[str, Any]:
         """Get statistics about the collection."""
         try:
@@ -146,18 +270,26 @@ class ChromaStorage:
                 n_results=n_results
             )
             
-            # Format results
-            formatted_results = []
-            if results['documents'] and results['documents'][0]:
-                for i, doc in enumerate(results['documents'][0]):
-                    formatted_results.append({
-                        "content": doc,
-                        "metadata": results['metadatas'][0][i] if results['metadatas'] and results['metadatas'][0] else {},
-                        "distance": results['distances'][0][i] if results['distances'] and results['distances'][0] else 0.0,
-                        "id": results['ids'][0][i] if results['ids'] and results['ids'][0] else ""
-                    })
+            if not results['documents'] or not results['documents'][0]:
+                return []
+            
+            # Format results in one pass over the parallel result lists,
+            # padding any list Chroma omitted with the default value
+            documents = results['documents'][0]
+            count = len(documents)
+            metadatas = results['metadatas'][0] if results['metadatas'] and results['metadatas'][0] else [{} for _ in range(count)]
+            distances = results['distances'][0] if results['distances'] and results['distances'][0] else [0.0] * count
+            ids = results['ids'][0] if results['ids'] and results['ids'][0] else [""] * count
             
-            return formatted_results
+            return [
+                {
+                    "content": doc,
+                    "metadata": metadata,
+                    "distance": distance,
+                    "id": chunk_id
+                }
+                for doc, metadata, distance, chunk_id in zip(documents, metadatas, distances, ids)
+            ]
             
         except Exception as e:
             logger.error(f"Error searching collection: {e}")
@@ -177,9 +309,10 @@ class ChromaStorage:
             if not self.collection:
                 return 0
             
-            # Get all documents with this source path
+            # Only the IDs are needed to delete
             results = self.collection.get(
-                where={"file_path": source_path}
+                where={"file_path": source_path},
+                include=[]
             )
             
             if not results['ids']:
@@ -202,11 +335,13 @@ class ChromaStorage:
             if not self.collection:
                 return False
             
-            # Delete the collection and recreate it
+            # Drop and recreate the collection: a metadata operation, instead of
+            # tombstoning every document with a per-row delete
             self.client.delete_collection(name=self.collection_name)
             self.collection = self.client.create_collection(
                 name=self.collection_name,
-                metadata={"description": "StackGuide document chunks"}
+                metadata={"description": "StackGuide document chunks"},
+                embedding_function=self.embedding_function
             )
             
             logger.info(f"Cleared collection: {self.collection_name}")
@@ -230,9 +365,10 @@ class ChromaStorage:
             if not self.collection:
                 return {"error": "Not connected to collection"}
             
-            # Get all documents with this source path
+            # Get metadata for all chunks with this source path
             results = self.collection.get(
-                where={"file_path": source_path}
+                where={"file_path": source_path},
+                include=["metadatas"]
             )
             
             if not results['ids']:
@@ -263,3 +399,74 @@ class ChromaStorage:
         except Exception as e:
             logger.error(f"Error getting source stats for {source_path}: {e}")
             return {"error": str(e)}
+
+
+class ChunkBuffer:
+    """Thread-safe buffer that groups chunks from many files into batched Chroma inserts."""
+    
+    def __init__(self, storage: ChromaStorage, batch_size: int = 500):
+        """
+        Initialize the chunk buffer.
+        
+        Args:
+            storage: Chroma storage used to flush batches
+            batch_size: Number of chunks that triggers a flush
+        """
+        self.storage = storage
+        self.batch_size = batch_size
+        self.stored_count = 0
+        # Files with chunks in a batch that failed to store
+        self.failed_files = set()
+        self._batch = ChunkBatch()
+        self._lock = threading.Lock()
+    
+    def add(self, chunks: List[Dict[str, Any]], source_name: str = None, start_index: int = 0):
+        """
+        Queue chunks for storage, flushing a full batch if the buffer is full.
+        
+        Args:
+            chunks: List of chunks to store
+            source_name: Name of the source these chunks came from
+            start_index: Index of the first chunk within its file
+        """
+        if not chunks:
+            return
+        
+        # Build the Chroma payload outside the lock; only the append is serialized
+        prepared = self.storage.prepare_chunks(chunks, source_name, start_index)
+        
+        with self._lock:
+            self._batch.extend(prepared)
+            
+            if len(self._batch) < self.batch_size:
+                return
+            batch = self._take_batch()
+        
+        self._store_batch(batch)
+    
+    def flush(self) -> int:
+        """
+        Store any buffered chunks.
+        
+        Returns:
+            Total number of chunks stored through this buffer
+        """
+        with self._lock:
+            batch = self._take_batch()
+        
+        self._store_batch(batch)
+        return self.stored_count
+    
+    def _take_batch(self) -> ChunkBatch:
+        """Swap out the buffered batch (caller must hold the lock)."""
+        batch = self._batch
+        self._batch = ChunkBatch()
+        return batch
+    
+    def _store_batch(self, batch: ChunkBatch):
+        """Send one batch to Chroma and record how many chunks were stored."""
+        stored = self.storage.add_batch(batch)
+        with self._lock:
+            self.stored_count += stored
+            if batch and not stored:
+                self.failed_files.update(metadata['file_path'] for metadata in batch.metadatas)
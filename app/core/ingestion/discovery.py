@@ -5,26 +5,96 @@ This module scans configured directories to discover coding projects and automat
 adds them as data sources for ingestion.
 """
 
+import functools
+import json
 import os
+import re
+import stat
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on auto-discovery paths scanned concurrently
+MAX_DISCOVERY_PATH_WORKERS = 8
+
+# Upper bound on candidate directories classified concurrently within one path
+MAX_CLASSIFY_WORKERS = os.cpu_count() or 4
+
+# Marker file -> project type, checked in priority order
+_PROJECT_TYPE_MARKERS = (
+    ('package.json', "Node.js"),
+    ('requirements.txt', "Python"),
+    ('Cargo.toml', "Rust"),
+    ('go.mod', "Go"),
+    ('pom.xml', "Java"),
+    ('.git', "Git Repository")
+)
+
+# Version of the on-disk discovery cache format; other versions are ignored
+DISCOVERY_CACHE_VERSION = 2
+
+# README files a project description is read from, in order of preference
+README_FILES = ('README.md', 'README.txt', 'README')
+
+# Bytes read from the start of a README when looking for a description
+README_PREFIX_BYTES = 512
+
+# First "meaningful" README line: not blank, a Markdown header or an HTML comment
+_README_FIRST_LINE_RE = re.compile(r'^[^\S\n]*(?!#|<!--)(\S[^\n]*)', re.MULTILINE)
+
 
 class ProjectDiscovery:
     """Automatically discovers coding projects from common paths."""
     
-    def __init__(self):
-        """Initialize the project discovery system."""
+    def __init__(self, cache_path: Optional[Path] = None):
+        """
+        Initialize the project discovery system.
+        
+        Args:
+            cache_path: JSON file the mtime-validated scan results are persisted
+                to, so a new process can skip rescanning unchanged directories
+                (no persistence if omitted)
+        """
         # Common project indicator files
-        self.project_indicators = [
+        self.project_indicators = frozenset([
             'README.md', 'README.txt', 'package.json', 'requirements.txt', 
             'setup.py', 'pyproject.toml', 'Cargo.toml', 'go.mod', 'pom.xml',
             'build.gradle', 'Makefile', 'Dockerfile', '.git', '.gitignore',
             'src', 'lib', 'app', 'main.py', 'index.js', 'main.go'
-        ]
+        ])
+        
+        # Tool, dependency and build-output directories that are never projects
+        # themselves; hidden directories are skipped as well
+        self._skip_dirs = frozenset([
+            'node_modules', '.venv', 'venv', 'env', '.git', '__pycache__',
+            'target', 'dist', 'build', '.tox', '.mypy_cache', '.pytest_cache',
+            '.idea', '.vscode'
+        ])
+        
+        # Home directory and container path mappings don't change while running
+        self._home = os.path.expanduser('~')
+        self._map_to_container_path = functools.lru_cache(maxsize=64)(self._map_to_container_path_impl)
+        
+        # README first lines keyed by (path, mtime), so active projects whose
+        # directory mtime keeps changing don't re-read an unchanged README
+        self._readme_summary = functools.lru_cache(maxsize=1024)(self._readme_summary_impl)
+        
+        # Scan results keyed by directory path and validated against the directory's
+        # st_mtime_ns, which changes whenever an entry is added, removed or renamed.
+        # Classifications only hold what the listing decides; README text is
+        # resolved through _readme_summary, since editing a README in place
+        # does not change the directory's mtime. A refresh where nothing
+        # changed lists no directories, but still stats each root, each
+        # candidate directory and each project README once
+        self._scan_cache: Dict[str, Tuple[int, List[Tuple[str, str]]]] = {}
+        self._classify_cache: Dict[str, Tuple[int, Optional[Dict[str, Any]]]] = {}
+        self._cache_dirty = False
+        self.cache_path = cache_path
+        self._load_cache()
     
     def discover_projects_from_paths(self, common_paths: List[str]) -> List[Dict[str, Any]]:
         """
@@ -38,33 +108,104 @@ class ProjectDiscovery:
         """
         discovered_projects = []
         
-        for path_pattern in common_paths:
-            try:
-                # Expand user path (e.g., ~/Development -> /Users/username/Development)
-                expanded_path = os.path.expanduser(path_pattern)
-                
-                # Map to container path if it's a user path
-                container_path = self._map_to_container_path(path_pattern, expanded_path)
-                
-                logger.info(f"Scanning auto-discovery path: {path_pattern} -> {container_path}")
-                
-                if os.path.exists(container_path):
-                    # Find projects in this directory
-                    projects = self._discover_projects_in_directory(container_path)
-                    discovered_projects.extend(projects)
-                else:
-                    logger.warning(f"Auto-discovery path does not exist: {container_path}")
-                    
-            except Exception as e:
-                logger.error(f"Error scanning auto-discovery path {path_pattern}: {e}")
+        # Scanning is dominated by blocking filesystem calls, which release the
+        # GIL, so paths are scanned concurrently (results keep the path order)
+        with ThreadPoolExecutor(max_workers=max(1, min(MAX_DISCOVERY_PATH_WORKERS, len(common_paths)))) as executor:
+            for projects in executor.map(self._scan_one, common_paths):
+                discovered_projects.extend(projects)
+        
+        self._save_cache()
         
         logger.info(f"Auto-discovery complete. Found {len(discovered_projects)} projects")
         return discovered_projects
     
-    def _map_to_container_path(self, path_pattern: str, expanded_path: str) -> str:
+    def _load_cache(self):
+        """Load persisted scan results, if a cache file is configured and readable."""
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+            
+            if data.get("version") != DISCOVERY_CACHE_VERSION:
+                logger.info(f"Ignoring discovery cache with unknown version: {self.cache_path}")
+                return
+            
+            self._scan_cache = {
+                path: (mtime_ns, [tuple(candidate) for candidate in candidates])
+                for path, (mtime_ns, candidates) in data.get("scans", {}).items()
+            }
+            self._classify_cache = {
+                path: (mtime_ns, classification)
+                for path, (mtime_ns, classification) in data.get("classifications", {}).items()
+            }
+            logger.debug(f"Loaded discovery cache from {self.cache_path}")
+            
+        except Exception as e:
+            logger.warning(f"Error loading discovery cache from {self.cache_path}: {e}")
+    
+    def _save_cache(self):
+        """Persist scan results if a cache file is configured and anything changed."""
+        if self.cache_path is None or not self._cache_dirty:
+            return
+        
+        try:
+            data = {
+                "version": DISCOVERY_CACHE_VERSION,
+                "scans": self._scan_cache,
+                "classifications": self._classify_cache
+            }
+            
+            # Write to a temporary file and swap it in, so readers never see a partial cache
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.cache_path.with_suffix(".tmp")
+            with open(temp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.cache_path)
+            
+            self._cache_dirty = False
+            
+        except Exception as e:
+            logger.warning(f"Error saving discovery cache to {self.cache_path}: {e}")
+    
+    def _scan_one(self, path_pattern: str) -> List[Dict[str, Any]]:
+        """
+        Discover projects under a single auto-discovery path.
+        
+        Args:
+            path_pattern: Path pattern to scan (e.g., '~/Development')
+            
+        Returns:
+            List of discovered project configurations (empty on error)
+        """
+        try:
+            # Expand user path (e.g., ~/Development -> /Users/username/Development)
+            expanded_path = os.path.expanduser(path_pattern)
+            
+            # Map to container path if it's a user path
+            container_path = self._map_to_container_path(path_pattern, expanded_path)
+            
+            logger.info(f"Scanning auto-discovery path: {path_pattern} -> {container_path}")
+            
+            if os.path.exists(container_path):
+                # Find projects in this directory
+                return self._discover_projects_in_directory(container_path)
+            
+            logger.warning(f"Auto-discovery path does not exist: {container_path}")
+            
+        except Exception as e:
+            logger.error(f"Error scanning auto-discovery path {path_pattern}: {e}")
+        
+        return []
+    
+    def _map_to_container_path_impl(self, path_pattern: str, expanded_path: str) -> str:
         """
         Map a user path to the corresponding container path.
         
+        Called through the per-instance LRU cache bound in __init__ as
+        _map_to_container_path.
+        
         Args:
             path_pattern: Original path pattern (e.g., ~/Development)
             expanded_path: Expanded absolute path
@@ -77,12 +218,12 @@ class ProjectDiscovery:
             # Since we're using ..:/host, we need to handle the path mapping correctly
             # The ..:/host maps the parent directory to /host
             # So ~/Development/my_code becomes /host (which contains all projects)
-            if 'Development' in expanded_path:
+            if expanded_path.startswith(self._home + '/Development'):
                 # For Development paths, map to /host since that's where all projects are
                 return "/host"
             else:
                 # For other paths, try to map them appropriately
-                return f"/host{expanded_path.replace(os.path.expanduser('~'), '')}"
+                return f"/host{expanded_path.replace(self._home, '')}"
         else:
             return expanded_path
     
@@ -99,25 +240,46 @@ class ProjectDiscovery:
         projects = []
         
         try:
-            if not os.path.exists(directory_path) or not os.path.isdir(directory_path):
+            # One stat both checks the root and validates its cached listing
+            try:
+                root_stat = os.stat(directory_path)
+            except OSError:
+                return projects
+            if not stat.S_ISDIR(root_stat.st_mode):
                 return projects
             
-            # List contents of the directory
-            for item in os.listdir(directory_path):
-                item_path = os.path.join(directory_path, item)
-                
-                if not os.path.isdir(item_path):
-                    continue
+            # List contents of the directory, reusing the last listing if the
+            # directory itself is unchanged
+            mtime_ns = root_stat.st_mtime_ns
+            cached = self._scan_cache.get(directory_path)
+            if cached is not None and cached[0] == mtime_ns:
+                candidates = cached[1]
+            else:
+                with os.scandir(directory_path) as entries:
+                    candidates = [
+                        (entry.path, entry.name)
+                        for entry in entries
+                        if not self._is_skipped_directory(entry.name) and entry.is_dir()
+                    ]
+                self._scan_cache[directory_path] = (mtime_ns, candidates)
+                self._cache_dirty = True
+            
+            if not candidates:
+                return projects
+            
+            # Classify candidates concurrently; each needs its own directory listing
+            with ThreadPoolExecutor(max_workers=min(MAX_CLASSIFY_WORKERS, len(candidates))) as executor:
+                classifications = executor.map(self._classify_directory_cached, [path for path, _ in candidates])
                 
-                # Check if this looks like a project by looking for common project files
-                if self._is_project_directory(item_path):
-                    project_name = item
-                    project_description = self._generate_project_description(item_path)
+                for (path, name), classification in zip(candidates, classifications):
+                    if classification is None:
+                        continue
                     
                     projects.append({
-                        "path": item_path,
-                        "name": project_name,
-                        "description": project_description,
+                        "path": path,
+                        "name": name,
+                        "description": classification["description"],
+                        "project_type": classification["project_type"],
                         "type": "local",
                         "enabled": True
                     })
@@ -127,75 +289,175 @@ class ProjectDiscovery:
         
         return projects
     
-    def _is_project_directory(self, directory_path: str) -> bool:
+    def _is_skipped_directory(self, name: str) -> bool:
+        """Check whether a directory name is hidden or on the skip list."""
+        return name in self._skip_dirs or name.startswith('.')
+    
+    def _classify_directory_cached(self, directory_path: str) -> Optional[Dict[str, str]]:
         """
-        Check if a directory looks like a project by looking for common project files.
+        Classify a directory, reusing the previous listing result while its mtime is unchanged.
+        
+        The description is resolved on every call, so README edits are picked
+        up; unchanged READMEs are served from the _readme_summary cache.
         
         Args:
-            directory_path: Path to check
+            directory_path: Directory to classify
             
         Returns:
-            True if directory appears to be a project
+            Dictionary with "description" and "project_type", or None if the
+            directory does not look like a project
         """
         try:
-            # Check for any of these indicators
-            for indicator in self.project_indicators:
-                indicator_path = os.path.join(directory_path, indicator)
-                if os.path.exists(indicator_path):
-                    return True
+            mtime_ns = os.stat(directory_path).st_mtime_ns
+        except OSError as e:
+            logger.debug(f"Cannot stat {directory_path}: {e}")
+            return None
+        
+        cached = self._classify_cache.get(directory_path)
+        if cached is not None and cached[0] == mtime_ns:
+            classification = cached[1]
+        else:
+            classification = self._classify_directory(directory_path)
+            self._classify_cache[directory_path] = (mtime_ns, classification)
+            self._cache_dirty = True
+        
+        if classification is None:
+            return None
+        
+        return {
+            "description": self._describe_project(
+                directory_path, classification["readme_files"], classification["fallback_description"]
+            ),
+            "project_type": classification["project_type"]
+        }
+    
+    def _classify_directory(self, directory_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Decide whether a directory is a project, and type it, from one listing.
+        
+        The directory is read with a single os.scandir call; the indicator,
+        README and project type checks all run against that listing.
+        
+        Args:
+            directory_path: Directory to classify
             
-            # Also check if it's a git repository
-            git_path = os.path.join(directory_path, '.git')
-            if os.path.exists(git_path) and os.path.isdir(git_path):
-                return True
+        Returns:
+            Dictionary with "project_type", the "readme_files" present and the
+            "fallback_description" used when none of them gives a description,
+            or None if the directory does not look like a project
+        """
+        entries = self._list_entries(directory_path)
+        
+        if not self._is_project_directory(entries):
+            return None
+        
+        return {
+            "project_type": self._determine_project_type(directory_path, entries),
+            "readme_files": [readme for readme in README_FILES if readme in entries],
+            "fallback_description": self._fallback_description(entries)
+        }
+    
+    def _list_entries(self, directory_path: str) -> Dict[str, os.DirEntry]:
+        """
+        List the entries directly inside a directory with a single scandir pass.
+        
+        Args:
+            directory_path: Directory to list
             
-            return False
+        Returns:
+            Entries keyed by name (empty if the directory cannot be read)
+        """
+        try:
+            with os.scandir(directory_path) as entries:
+                return {entry.name: entry for entry in entries}
+        except OSError as e:
+            logger.debug(f"Cannot list {directory_path}: {e}")
+            return {}
+    
+    def _is_project_directory(self, entries: Dict[str, os.DirEntry]) -> bool:
+        """
+        Check if a directory looks like a project by looking for common project files.
+        
+        Args:
+            entries: Entries of the directory, keyed by name
             
-        except Exception as e:
-            logger.error(f"Error checking if {directory_path} is a project: {e}")
-            return False
+        Returns:
+            True if directory appears to be a project
+        """
+        # '.git' is one of the indicators, so git repositories (including
+        # worktrees and submodules, where '.git' is a file) are recognised
+        # from the listing alone, without a separate exists/isdir check
+        return not self.project_indicators.isdisjoint(entries)
     
-    def _generate_project_description(self, project_path: str) -> str:
+    def _describe_project(self, project_path: str, readme_files: List[str], fallback_description: str) -> str:
         """
-        Generate a description for a discovered project.
+        Describe a project from the first README with a meaningful line.
         
         Args:
             project_path: Path to the project
+            readme_files: Names of the README files present, in order of preference
+            fallback_description: Description to use when no README provides one
             
         Returns:
-            Generated description
+            Project description
         """
-        try:
-            # Try to read README for description
-            readme_files = ['README.md', 'README.txt', 'README']
-            for readme in readme_files:
-                readme_path = os.path.join(project_path, readme)
-                if os.path.exists(readme_path):
-                    try:
-                        with open(readme_path, 'r', encoding='utf-8') as f:
-                            content = f.read(500)  # Read first 500 chars
-                            # Extract first meaningful line
-                            lines = content.split('\n')
-                            for line in lines:
-                                line = line.strip()
-                                if line and not line.startswith('#') and not line.startswith('<!--'):
-                                    return line[:100] + "..." if len(line) > 100 else line
-                    except Exception:
-                        pass
-            
-            # Fallback: check for package.json or similar
-            package_files = ['package.json', 'pyproject.toml', 'Cargo.toml', 'go.mod']
-            for package_file in package_files:
-                package_path = os.path.join(project_path, package_file)
-                if os.path.exists(package_path):
-                    return f"Project with {package_file}"
-            
-            # Final fallback
-            return "Discovered project directory"
+        for readme in readme_files:
+            readme_path = os.path.join(project_path, readme)
+            try:
+                summary = self._readme_summary(readme_path, os.stat(readme_path).st_mtime_ns)
+            except OSError:
+                continue
+            if summary is not None:
+                return summary
+        
+        return fallback_description
+    
+    def _fallback_description(self, entries: Dict[str, os.DirEntry]) -> str:
+        """Describe a project without a README by its package manifest, if any."""
+        package_files = ['package.json', 'pyproject.toml', 'Cargo.toml', 'go.mod']
+        for package_file in package_files:
+            if package_file in entries:
+                return f"Project with {package_file}"
+        
+        return "Discovered project directory"
+    
+    def _readme_summary_impl(self, readme_path: str, mtime_ns: int) -> Optional[str]:
+        """
+        Extract the first meaningful line of a README.
+        
+        Called through the per-instance LRU cache bound in __init__ as
+        _readme_summary; mtime_ns is part of the cache key, so an edited
+        README is read again.
+        
+        Args:
+            readme_path: Path to the README file
+            mtime_ns: Modification time of the README in nanoseconds
             
-        except Exception as e:
-            logger.error(f"Error generating description for {project_path}: {e}")
-            return "Discovered project directory"
+        Returns:
+            Description line (truncated to 100 characters), or None if the
+            README has no meaningful line or cannot be read
+        """
+        try:
+            # Only the start of the file is needed, so read it with one raw
+            # os.read instead of setting up a buffered text wrapper
+            fd = os.open(readme_path, os.O_RDONLY)
+            try:
+                raw = os.read(fd, README_PREFIX_BYTES)
+            finally:
+                os.close(fd)
+        except OSError:
+            return None
+        
+        if not raw:
+            return None
+        content = raw.decode('utf-8', errors='replace')
+        
+        # Extract first meaningful line
+        match = _README_FIRST_LINE_RE.search(content)
+        if match is None:
+            return None
+        line = match.group(1).strip()
+        return line[:100] + "..." if len(line) > 100 else line
     
     def get_project_stats(self, projects: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -210,36 +472,31 @@ class ProjectDiscovery:
         if not projects:
             return {"total_projects": 0, "by_type": {}}
         
-        # Count by project type indicators
-        by_type = {}
-        for project in projects:
-            project_path = project["path"]
-            
-            # Determine project type based on indicators
-            project_type = self._determine_project_type(project_path)
-            by_type[project_type] = by_type.get(project_type, 0) + 1
+        # Count by project type, using the type found during discovery and
+        # classifying only if it is missing
+        by_type = Counter(
+            project.get("project_type") or self._determine_project_type(project["path"])
+            for project in projects
+        )
         
         return {
             "total_projects": len(projects),
-            "by_type": by_type
+            "by_type": dict(by_type)
         }
     
-    def _determine_project_type(self, project_path: str) -> str:
+    def _determine_project_type(
+        self, 
+        project_path: str, 
+        entries: Optional[Dict[str, os.DirEntry]] = None
+    ) -> str:
         """Determine the type of project based on its contents."""
         try:
-            if os.path.exists(os.path.join(project_path, 'package.json')):
-                return "Node.js"
-            elif os.path.exists(os.path.join(project_path, 'requirements.txt')):
-                return "Python"
-            elif os.path.exists(os.path.join(project_path, 'Cargo.toml')):
-                return "Rust"
-            elif os.path.exists(os.path.join(project_path, 'go.mod')):
-                return "Go"
-            elif os.path.exists(os.path.join(project_path, 'pom.xml')):
-                return "Java"
-            elif os.path.exists(os.path.join(project_path, '.git')):
-                return "Git Repository"
-            else:
-                return "Unknown"
+            if entries is None:
+                entries = self._list_entries(project_path)
+            
+            for marker, project_type in _PROJECT_TYPE_MARKERS:
+                if marker in entries:
+                    return project_type
+            return "Unknown"
         except Exception:
             return "Unknown"
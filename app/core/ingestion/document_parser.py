@@ -5,347 +5,573 @@ This module parses various document formats and creates semantic chunks
 that can be stored in the vector database for retrieval.
 """
 
+import codecs
+import configparser
+import csv
+import io
+import json
+import mmap
+import os
 import re
+from dataclasses import replace
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional
+from xml.etree import ElementTree
 import logging
 
+try:
+    import yaml
+    
+    # libyaml-backed C loader/dumper when PyYAML was built with it
+    _YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    _YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+except ImportError:  # YAML files are skipped without PyYAML
+    yaml = None
+
+from .models import FileMetadata
+
 logger = logging.getLogger(__name__)
 
+# Text files larger than this are memory-mapped and chunked incrementally
+STREAM_THRESHOLD_BYTES = 1024 * 1024
+STREAM_BLOCK_BYTES = 64 * 1024
+
+# Formats that must be loaded whole (YAML, CSV) are skipped above this size
+MAX_STRUCTURED_FILE_BYTES = 16 * 1024 * 1024
+
+# File extension -> parser name (bound to a _parse_<name> method per parser instance)
+_PARSER_BY_EXTENSION: Dict[str, str] = {
+    '.md': 'markdown', '.markdown': 'markdown',
+    '.txt': 'text', '.log': 'text',
+    '.json': 'json',
+    '.yaml': 'yaml', '.yml': 'yaml',
+    '.xml': 'xml',
+    '.ini': 'ini', '.cfg': 'ini', '.conf': 'ini',
+    '.sql': 'sql',
+    '.csv': 'csv',
+    '.py': 'code', '.js': 'code', '.ts': 'code', '.java': 'code',
+    '.cpp': 'code', '.c': 'code', '.h': 'code',
+}
+
+# Lines that mark a natural function/class/block boundary in code files: after
+# leading whitespace, a keyword followed by a space and more text, or '}' / 'end'
+_CODE_BOUNDARY_RE = re.compile(
+    r'^[^\S\n]*(?:(?:def|class|function|public|private) (?=[^\n]*\S)|\}|end)',
+    re.MULTILINE
+)
+
+
+def _is_markdown_header(line: str) -> bool:
+    """Return True for an ATX header line: 1-6 '#', whitespace, then header text."""
+    if not line.startswith('#'):
+        return False
+    rest = line.lstrip('#')
+    return len(line) - len(rest) <= 6 and len(rest) >= 2 and rest[0].isspace()
+
+
+def _text_decoder() -> io.IncrementalNewlineDecoder:
+    """Return a UTF-8 decoder with universal newlines, matching text-mode open()."""
+    return io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(), translate=True)
+
+
+class _NullTreeTarget:
+    """Parser target without callbacks: expat still checks the document, but no tree is built."""
+
+
+def _check_xml_well_formed(file_path: Path):
+    """
+    Feed a file through the XML parser block by block to check it is well-formed.
+    
+    Args:
+        file_path: Path to the XML file
+        
+    Raises:
+        ElementTree.ParseError: If the document is not well-formed
+    """
+    parser = ElementTree.XMLParser(target=_NullTreeTarget())
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(STREAM_BLOCK_BYTES), b''):
+            parser.feed(block)
+    parser.close()
+
 
 class DocumentParser:
     """Parses documents into searchable text chunks."""
     
-    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
+    def __init__(
+        self, 
+        chunk_size: int = 1000, 
+        chunk_overlap: int = 200, 
+        max_file_bytes: int = MAX_STRUCTURED_FILE_BYTES
+    ):
         """
         Initialize the document parser.
         
         Args:
             chunk_size: Maximum size of each chunk in characters
             chunk_overlap: Overlap between chunks in characters
+            max_file_bytes: Size limit for formats that are loaded whole
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.max_file_bytes = max_file_bytes
+        
+        # Extension -> bound parser method, resolved once
+        self._dispatch = {
+            extension: getattr(self, f"_parse_{parser_name}")
+            for extension, parser_name in _PARSER_BY_EXTENSION.items()
+        }
     
-    def parse_file(self, file_path: Path) -> List[Dict[str, Any]]:
+    def parse_file(self, file_path: Path) -> Iterator[Dict[str, Any]]:
         """
-        Parse a file and return chunks with metadata.
+        Parse a file and yield chunks with metadata.
+        
+        Chunks are produced lazily so callers can store them in batches
+        without holding every chunk of a large file in memory.
         
         Args:
             file_path: Path to the file to parse
             
-        Returns:
-            List of chunks with content and metadata
+        Yields:
+            Chunks with content and metadata. File-level fields are shared
+            through a single FileMetadata under "file_metadata"; the
+            "metadata" dict only holds chunk-specific fields.
         """
         try:
-            # Determine file type and parse accordingly
-            file_extension = file_path.suffix.lower()
-            
-            if file_extension in ['.md', '.markdown']:
-                return self._parse_markdown(file_path)
-            elif file_extension in ['.txt', '.log']:
-                return self._parse_text(file_path)
-            elif file_extension in ['.json']:
-                return self._parse_json(file_path)
-            elif file_extension in ['.yaml', '.yml']:
-                return self._parse_yaml(file_path)
-            elif file_extension in ['.xml']:
-                return self._parse_xml(file_path)
-            elif file_extension in ['.ini', '.cfg', '.conf']:
-                return self._parse_ini(file_path)
-            elif file_extension in ['.sql']:
-                return self._parse_sql(file_path)
-            elif file_extension in ['.csv']:
-                return self._parse_csv(file_path)
-            elif file_extension in ['.py', '.js', '.ts', '.java', '.cpp', '.c', '.h']:
-                return self._parse_code(file_path)
-            else:
-                # Try to parse as text for unknown types
-                return self._parse_text(file_path)
-                
+            yield from self.iter_chunks(file_path)
         except Exception as e:
             logger.error(f"Error parsing file {file_path}: {e}")
-            return []
     
-    def _parse_markdown(self, file_path: Path) -> List[Dict[str, Any]]:
-        """Parse Markdown files with section awareness."""
-        try:
-            content = file_path.read_text(encoding='utf-8')
-            chunks = []
-            
-            # Split by headers to maintain semantic structure
-            sections = re.split(r'^(#{1,6}\s+.+)$', content, flags=re.MULTILINE)
-            
-            current_section = ""
-            current_header = "Document"
-            
-            for section in sections:
-                if section.strip():
-                    if section.startswith('#'):
-                        # This is a header
-                        current_header = section.strip()
-                        current_section = ""
-                    else:
-                        # This is content
-                        current_section = section.strip()
-                        if current_section:
-                            # Create chunks from this section
-                            section_chunks = self._create_chunks(
-                                current_section, 
-                                file_path, 
-                                current_header
-                            )
-                            chunks.extend(section_chunks)
-            
-            return chunks
+    def iter_chunks(self, file_path: Path) -> Iterator[Dict[str, Any]]:
+        """
+        Parse a file and yield chunks, raising on parse errors.
+        
+        Unlike parse_file, errors are not swallowed: a decode or parse
+        failure partway through a file propagates after the earlier chunks
+        were yielded, so callers can discard the partial result instead of
+        tracking the file as indexed.
+        
+        Args:
+            file_path: Path to the file to parse
             
-        except Exception as e:
-            logger.error(f"Error parsing Markdown file {file_path}: {e}")
-            return []
+        Yields:
+            Chunks with content and metadata, as for parse_file
+        """
+        # Resolve the path-derived fields once and pass them down
+        file_meta = FileMetadata.from_path(file_path)
+        
+        # Determine file type and parse accordingly; unknown types are parsed as text
+        parser = self._dispatch.get(file_path.suffix.lower(), self._parse_text)
+        yield from parser(file_path, file_meta)
     
-    def _parse_text(self, file_path: Path) -> List[Dict[str, Any]]:
+    def _parse_markdown(self, file_path: Path, file_meta: FileMetadata) -> Iterator[Dict[str, Any]]:
+        """Parse Markdown files with section awareness."""
+        content = file_path.read_text(encoding='utf-8')
+        
+        # Walk the lines once, flushing the collected section at each
+        # header to maintain semantic structure
+        current_header = "Document"
+        section_lines = []
+        
+        for line in content.split('\n'):
+            if _is_markdown_header(line):
+                current_section = '\n'.join(section_lines).strip()
+                if current_section:
+                    # Create chunks from this section
+                    yield from self._create_chunks(current_section, file_meta, current_header)
+                current_header = line.strip()
+                section_lines = []
+            else:
+                section_lines.append(line)
+        
+        current_section = '\n'.join(section_lines).strip()
+        if current_section:
+            yield from self._create_chunks(current_section, file_meta, current_header)
+    
+    def _parse_text(self, file_path: Path, file_meta: FileMetadata) -> Iterator[Dict[str, Any]]:
         """Parse plain text files."""
-        try:
-            content = file_path.read_text(encoding='utf-8')
-            return self._create_chunks(content, file_path, "Text Document")
-        except Exception as e:
-            logger.error(f"Error parsing text file {file_path}: {e}")
-            return []
+        yield from self._chunk_file_text(file_path, file_meta, "Text Document")
     
-    def _parse_json(self, file_path: Path) -> List[Dict[str, Any]]:
-        """Parse JSON files."""
-        try:
-            import json
-            content = file_path.read_text(encoding='utf-8')
-            data = json.loads(content)
+    def _chunk_file_text(
+        self, 
+        file_path: Path, 
+        file_meta: FileMetadata, 
+        doc_type: str, 
+        validate: Optional[Callable[[str], Any]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Chunk a file's raw text, streaming it when the file is large.
+        
+        Args:
+            file_path: Path to the file
+            file_meta: Shared metadata of the source file
+            doc_type: Type of document
+            validate: Called with the whole text of files up to
+                STREAM_THRESHOLD_BYTES before chunking; raises to reject the
+                file (streamed files are not validated)
             
-            # Convert JSON to readable text
-            json_text = json.dumps(data, indent=2)
-            return self._create_chunks(json_text, file_path, "JSON Document")
+        Yields:
+            Chunks with content and metadata
+        """
+        with open(file_path, 'rb') as f:
+            file_size = os.fstat(f.fileno()).st_size
+            
+            if file_size <= STREAM_THRESHOLD_BYTES:
+                text = _text_decoder().decode(f.read(), final=True)
+                if validate is not None:
+                    validate(text)
+                yield from self._create_chunks(text, file_meta, doc_type)
+                return
+            
+            # Large files are chunked block by block; the character count
+            # is unknown up front, so total_length reports the byte size
+            yield from self._create_chunks_streaming(self._iter_mmap_blocks(f), file_meta, doc_type, file_size)
+    
+    def _iter_mmap_blocks(self, f) -> Iterator[str]:
+        """
+        Decode a file through a read-only memory map, one block at a time.
+        
+        Pages are read straight from the page cache and only one decoded block
+        is alive at a time, so the full text is never held in memory.
+        
+        Args:
+            f: File opened in binary mode
             
-        except Exception as e:
-            logger.error(f"Error parsing JSON file {file_path}: {e}")
-            return []
+        Yields:
+            Consecutive blocks of decoded text
+        """
+        decoder = _text_decoder()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for pos in range(0, len(mm), STREAM_BLOCK_BYTES):
+                block = decoder.decode(mm[pos:pos + STREAM_BLOCK_BYTES])
+                if block:
+                    yield block
+        
+        block = decoder.decode(b'', final=True)
+        if block:
+            yield block
+    
+    def _exceeds_size_limit(self, file_path: Path) -> bool:
+        """Check (and log) whether a file is too large to load whole."""
+        file_size = file_path.stat().st_size
+        if file_size > self.max_file_bytes:
+            logger.warning(f"Skipping {file_path}: {file_size} bytes exceeds the {self.max_file_bytes} byte limit")
+            return True
+        return False
     
-    def _parse_yaml(self, file_path: Path) -> List[Dict[str, Any]]:
+    def _parse_json(self, file_path: Path, file_meta: FileMetadata) -> Iterator[Dict[str, Any]]:
+        """Parse JSON files."""
+        # The source text is already readable; chunk it as-is instead of
+        # round-tripping it through json.dumps. Files small enough to be read
+        # whole are still parsed once, so invalid JSON is rejected
+        yield from self._chunk_file_text(file_path, file_meta, "JSON Document", validate=json.loads)
+    
+    def _parse_yaml(self, file_path: Path, file_meta: FileMetadata) -> Iterator[Dict[str, Any]]:
         """Parse YAML files."""
-        try:
-            import yaml
-            content = file_path.read_text(encoding='utf-8')
-            data = yaml.safe_load(content)
-            
-            # Convert YAML to readable text
-            yaml_text = yaml.dump(data, default_flow_style=False)
-            return self._create_chunks(yaml_text, file_path, "YAML Document")
-            
-        except Exception as e:
-            logger.error(f"Error parsing YAML file {file_path}: {e}")
-            return []
+        if yaml is None:
+            logger.warning(f"Skipping {file_path}: PyYAML is not installed")
+            return
+        
+        if self._exceeds_size_limit(file_path):
+            return
+        
+        content = file_path.read_text(encoding='utf-8')
+        data = yaml.load(content, Loader=_YAML_LOADER)
+        
+        # Convert YAML to readable text
+        yaml_text = yaml.dump(data, Dumper=_YAML_DUMPER, default_flow_style=False)
+        yield from self._create_chunks(yaml_text, file_meta, "YAML Document")
     
-    def _parse_xml(self, file_path: Path) -> List[Dict[str, Any]]:
+    def _parse_xml(self, file_path: Path, file_meta: FileMetadata) -> Iterator[Dict[str, Any]]:
         """Parse XML files."""
-        try:
-            from xml.etree import ElementTree
-            tree = ElementTree.parse(file_path)
-            root = tree.getroot()
-            
-            # Convert XML to readable text
-            xml_text = ElementTree.tostring(root, encoding='unicode', method='xml')
-            return self._create_chunks(xml_text, file_path, "XML Document")
-            
-        except Exception as e:
-            logger.error(f"Error parsing XML file {file_path}: {e}")
-            return []
+        # Check well-formedness incrementally; the parser target has no
+        # callbacks, so no elements are built at all
+        _check_xml_well_formed(file_path)
+        
+        # Chunk the source text as-is rather than a re-serialized tree
+        yield from self._chunk_file_text(file_path, file_meta, "XML Document")
     
-    def _parse_ini(self, file_path: Path) -> List[Dict[str, Any]]:
+    def _parse_ini(self, file_path: Path, file_meta: FileMetadata) -> Iterator[Dict[str, Any]]:
         """Parse INI configuration files."""
-        try:
-            import configparser
-            config = configparser.ConfigParser()
-            config.read(file_path)
-            
-            # Convert INI to readable text
-            ini_text = ""
-            for section in config.sections():
-                ini_text += f"[{section}]\n"
-                for key, value in config.items(section):
-                    ini_text += f"{key} = {value}\n"
-                ini_text += "\n"
-            
-            return self._create_chunks(ini_text, file_path, "Configuration File")
-            
-        except Exception as e:
-            logger.error(f"Error parsing INI file {file_path}: {e}")
-            return []
+        config = configparser.ConfigParser()
+        config.read(file_path)
+        
+        # Convert INI to readable text
+        lines = []
+        for section in config.sections():
+            lines.append(f"[{section}]")
+            lines.extend(f"{key} = {value}" for key, value in config.items(section))
+            lines.append("")
+        lines.append("")  # Keep the trailing newline of the last line
+        ini_text = "\n".join(lines)
+        
+        yield from self._create_chunks(ini_text, file_meta, "Configuration File")
     
-    def _parse_sql(self, file_path: Path) -> List[Dict[str, Any]]:
+    def _parse_sql(self, file_path: Path, file_meta: FileMetadata) -> Iterator[Dict[str, Any]]:
         """Parse SQL files."""
-        try:
-            content = file_path.read_text(encoding='utf-8')
-            
-            # Split by semicolons to separate statements
-            statements = [stmt.strip() for stmt in content.split(';') if stmt.strip()]
-            
-            chunks = []
-            for i, statement in enumerate(statements):
-                if statement:
-                    chunk = {
-                        "content": statement,
-                        "metadata": {
-                            "file_path": str(file_path),
-                            "file_name": file_path.name,
-                            "file_type": "sql",
-                            "chunk_type": "sql_statement",
-                            "statement_index": i,
-                            "total_statements": len(statements)
-                        }
+        content = file_path.read_text(encoding='utf-8')
+        
+        # Split by semicolons to separate statements
+        statements = [stmt.strip() for stmt in content.split(';') if stmt.strip()]
+        
+        file_meta = replace(file_meta, file_type="sql")
+        for i, statement in enumerate(statements):
+            if statement:
+                yield {
+                    "content": statement,
+                    "file_metadata": file_meta,
+                    "metadata": {
+                        "chunk_type": "sql_statement",
+                        "statement_index": i,
+                        "total_statements": len(statements)
                     }
-                    chunks.append(chunk)
-            
-            return chunks
-            
-        except Exception as e:
-            logger.error(f"Error parsing SQL file {file_path}: {e}")
-            return []
+                }
     
-    def _parse_csv(self, file_path: Path) -> List[Dict[str, Any]]:
+    def _parse_csv(self, file_path: Path, file_meta: FileMetadata) -> Iterator[Dict[str, Any]]:
         """Parse CSV files."""
-        try:
-            import csv
-            content = file_path.read_text(encoding='utf-8')
-            
-            # Parse CSV and convert to readable text
-            csv_text = ""
-            reader = csv.reader(content.splitlines())
-            
-            for i, row in enumerate(reader):
-                if i == 0:  # Header row
-                    csv_text += " | ".join(row) + "\n"
-                    csv_text += "-" * (len(" | ".join(row))) + "\n"
-                else:
-                    csv_text += " | ".join(row) + "\n"
-            
-            return self._create_chunks(csv_text, file_path, "CSV Document")
-            
-        except Exception as e:
-            logger.error(f"Error parsing CSV file {file_path}: {e}")
-            return []
+        if self._exceeds_size_limit(file_path):
+            return
+        
+        content = file_path.read_text(encoding='utf-8')
+        
+        # Parse CSV and convert to readable text
+        lines = []
+        reader = csv.reader(io.StringIO(content))
+        
+        for i, row in enumerate(reader):
+            line = " | ".join(row)
+            lines.append(line)
+            if i == 0:  # Header row
+                lines.append("-" * len(line))
+        lines.append("")  # Keep the trailing newline of the last row
+        csv_text = "\n".join(lines)
+        
+        yield from self._create_chunks(csv_text, file_meta, "CSV Document")
     
-    def _parse_code(self, file_path: Path) -> List[Dict[str, Any]]:
+    def _parse_code(self, file_path: Path, file_meta: FileMetadata) -> Iterator[Dict[str, Any]]:
         """Parse code files with function/class awareness."""
-        try:
-            content = file_path.read_text(encoding='utf-8')
-            
-            # For code files, try to maintain function/class boundaries
-            # This is a simplified approach - could be enhanced with AST parsing
-            lines = content.split('\n')
-            chunks = []
-            current_chunk = []
-            
-            for line in lines:
-                current_chunk.append(line)
-                
-                # Check if we've reached a natural boundary
-                if (line.strip().startswith(('def ', 'class ', 'function ', 'public ', 'private ')) or
-                    line.strip().startswith('}') or
-                    line.strip().startswith('end')):
-                    
-                    if current_chunk:
-                        chunk_text = '\n'.join(current_chunk)
-                        if len(chunk_text.strip()) > 50:  # Only add substantial chunks
-                            chunk = {
-                                "content": chunk_text,
-                                "metadata": {
-                                    "file_path": str(file_path),
-                                    "file_name": file_path.name,
-                                    "file_type": "code",
-                                    "chunk_type": "code_block",
-                                    "language": file_path.suffix[1:] if file_path.suffix else "unknown"
-                                }
-                            }
-                            chunks.append(chunk)
-                        current_chunk = []
-            
-            # Add any remaining content
-            if current_chunk:
-                chunk_text = '\n'.join(current_chunk)
-                if len(chunk_text.strip()) > 50:
-                    chunk = {
-                        "content": chunk_text,
-                        "metadata": {
-                            "file_path": str(file_path),
-                            "file_name": file_path.name,
-                            "file_type": "code",
-                            "chunk_type": "code_block",
-                            "language": file_path.suffix[1:] if file_path.suffix else "unknown"
-                        }
-                    }
-                    chunks.append(chunk)
-            
-            return chunks
-            
-        except Exception as e:
-            logger.error(f"Error parsing code file {file_path}: {e}")
-            return []
+        content = file_path.read_text(encoding='utf-8')
+        
+        language = file_meta.file_type
+        file_meta = replace(file_meta, file_type="code")
+        
+        # For code files, try to maintain function/class boundaries: each
+        # chunk runs up to and including the next boundary line
+        # This is a simplified approach - could be enhanced with AST parsing
+        chunk_start = 0
+        for match in _CODE_BOUNDARY_RE.finditer(content):
+            line_end = content.find('\n', match.end())
+            if line_end < 0:
+                line_end = len(content)
+            
+            chunk_text = content[chunk_start:line_end]
+            if len(chunk_text.strip()) > 50:  # Only add substantial chunks
+                yield self._create_code_chunk(chunk_text, file_meta, language)
+            chunk_start = line_end + 1
+        
+        # Add any remaining content
+        chunk_text = content[chunk_start:]
+        if len(chunk_text.strip()) > 50:
+            yield self._create_code_chunk(chunk_text, file_meta, language)
     
-    def _create_chunks(self, text: str, file_path: Path, doc_type: str) -> List[Dict[str, Any]]:
+    def _create_code_chunk(self, chunk_text: str, file_meta: FileMetadata, language: str) -> Dict[str, Any]:
+        """Build a single code chunk with its metadata."""
+        return {
+            "content": chunk_text,
+            "file_metadata": file_meta,
+            "metadata": {
+                "chunk_type": "code_block",
+                "language": language
+            }
+        }
+    
+    def _create_chunks(self, text: str, file_meta: FileMetadata, doc_type: str) -> Iterator[Dict[str, Any]]:
         """
         Create chunks from text with proper overlap.
         
+        Chunks are yielded as they are cut, so only one chunk is built at a time.
+        
         Args:
             text: Text content to chunk
-            file_path: Path to the source file
+            file_meta: Shared metadata of the source file
             doc_type: Type of document
             
-        Returns:
-            List of chunks with content and metadata
+        Yields:
+            Chunks with content and metadata
         """
-        if not text.strip():
-            return []
+        # isspace() scans in place, where strip() would copy the whole text
+        if not text or text.isspace():
+            return
         
-        chunks = []
         start = 0
+        text_length = len(text)
         
-        while start < len(text):
-            # Determine chunk end
-            end = start + self.chunk_size
-            
-            # Try to find a good break point (sentence or paragraph boundary)
-            if end < len(text):
-                # Look for sentence endings
-                for i in range(end, max(start + self.chunk_size - 100, start), -1):
-                    if text[i] in '.!?':
-                        end = i + 1
-                        break
-                
-                # If no sentence boundary found, look for paragraph breaks
-                if end == start + self.chunk_size:
-                    for i in range(end, max(start + self.chunk_size - 50, start), -1):
-                        if text[i] == '\n' and (i + 1 >= len(text) or text[i + 1] == '\n'):
-                            end = i + 1
-                            break
+        while start < text_length:
+            end = self._find_chunk_end(text, start)
             
             # Extract chunk content
             chunk_content = text[start:end].strip()
             
             if chunk_content:
-                chunk = {
-                    "content": chunk_content,
-                    "metadata": {
-                        "file_path": str(file_path),
-                        "file_name": file_path.name,
-                        "file_type": file_path.suffix[1:] if file_path.suffix else "unknown",
-                        "chunk_type": doc_type,
-                        "chunk_start": start,
-                        "chunk_end": end,
-                        "total_length": len(text)
-                    }
-                }
-                chunks.append(chunk)
+                yield self._create_text_chunk(chunk_content, file_meta, doc_type, start, end, text_length)
+            
+            # The chunk reaching the end of the text is the last one; a further
+            # chunk would only repeat its overlap
+            if end >= text_length:
+                break
             
             # Move to next chunk with overlap
-            start = end - self.chunk_overlap
-            if start >= len(text):
+            start = self._next_chunk_start(start, end)
+    
+    def _create_chunks_streaming(
+        self, 
+        blocks: Iterable[str], 
+        file_meta: FileMetadata, 
+        doc_type: str, 
+        total_length: int
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Create chunks from text arriving in blocks, without holding the whole text.
+        
+        Produces the same chunk boundaries as _create_chunks: a chunk is only
+        cut once the buffer extends past its boundary search window, and the
+        buffer is trimmed to the start of the next chunk after every block.
+        
+        Args:
+            blocks: Iterable of consecutive text blocks
+            file_meta: Shared metadata of the source file
+            doc_type: Type of document
+            total_length: Length reported in chunk metadata (the text length
+                is unknown until the stream ends)
+            
+        Yields:
+            Chunks with content and metadata
+        """
+        buffer = ""
+        base = 0  # Absolute offset of buffer[0]
+        start = 0
+        window = self.chunk_size + 2  # Boundary search reads up to text[end + 1]
+        
+        for block in blocks:
+            buffer += block
+            
+            while start - base + window <= len(buffer):
+                end = base + self._find_chunk_end(buffer, start - base)
+                chunk_content = buffer[start - base:end - base].strip()
+                if chunk_content:
+                    yield self._create_text_chunk(chunk_content, file_meta, doc_type, start, end, total_length)
+                start = self._next_chunk_start(start, end)
+            
+            # Drop text that no later chunk can reach
+            if start > base:
+                buffer = buffer[start - base:]
+                base = start
+        
+        # Remaining tail: the end of the text is now known
+        text_end = base + len(buffer)
+        while start < text_end:
+            end = base + self._find_chunk_end(buffer, start - base)
+            chunk_content = buffer[start - base:end - base].strip()
+            if chunk_content:
+                yield self._create_text_chunk(chunk_content, file_meta, doc_type, start, end, total_length)
+            if end >= text_end:
                 break
+            start = self._next_chunk_start(start, end)
+    
+    def _next_chunk_start(self, start: int, end: int) -> int:
+        """
+        Return where the chunk after text[start:end] begins.
+        
+        The next chunk overlaps the previous one by up to chunk_overlap
+        characters, but starts at least chunk_size - chunk_overlap (and at
+        least one) characters later, so an overlap close to the chunk size
+        can't make chunking quadratic. It never starts past end, so a chunk
+        cut early at a break point leaves no text out.
+        
+        Args:
+            start: Offset of the current chunk start
+            end: Offset one past the current chunk end
+            
+        Returns:
+            Offset of the next chunk start
+        """
+        min_step = max(1, self.chunk_size - self.chunk_overlap)
+        return max(end - self.chunk_overlap, min(start + min_step, end))
+    
+    def _find_chunk_end(self, text: str, start: int) -> int:
+        """
+        Find where the chunk starting at start should end.
+        
+        Prefers a sentence ending near the size limit, then a paragraph break.
+        
+        Args:
+            text: Text being chunked
+            start: Offset of the chunk start
+            
+        Returns:
+            Offset one past the last character of the chunk
+        """
+        end = start + self.chunk_size
+        
+        # Try to find a good break point (sentence or paragraph boundary).
+        # Both searches cover text[lo + 1:end + 1] and take the last match,
+        # using str.rfind so the scan runs in C rather than per character.
+        if end < len(text):
+            # Look for sentence endings
+            lo = max(end - 100, start) + 1
+            cut = max(text.rfind('.', lo, end + 1), text.rfind('!', lo, end + 1), text.rfind('?', lo, end + 1))
+            if cut >= 0:
+                return cut + 1
+            
+            # If no sentence boundary found, look for paragraph breaks
+            # (a newline followed by another newline or by the end of the text)
+            if end == len(text) - 1 and text[end] == '\n':
+                return end + 1
+            cut = text.rfind('\n\n', max(end - 50, start) + 1, end + 2)
+            if cut >= 0:
+                return cut + 1
+        
+        return end
+    
+    def _create_text_chunk(
+        self, 
+        chunk_content: str, 
+        file_meta: FileMetadata, 
+        doc_type: str, 
+        start: int, 
+        end: int, 
+        total_length: int
+    ) -> Dict[str, Any]:
+        """Build a single text chunk with its metadata."""
+        return {
+            "content": chunk_content,
+            "file_metadata": file_meta,
+            "metadata": {
+                "chunk_type": doc_type,
+                "chunk_start": start,
+                "chunk_end": end,
+                "total_length": total_length
+            }
+        }
+
+
+# Parser reused by parse_file_in_worker within one worker process
+_worker_parser: Optional[DocumentParser] = None
+
+
+def parse_file_in_worker(file_path: str, chunk_size: int, chunk_overlap: int) -> List[Dict[str, Any]]:
+    """
+    Parse a file into a list of chunks; the entry point for process-pool workers.
+    
+    Args:
+        file_path: Path to the file to parse
+        chunk_size: Chunk size of the calling parser
+        chunk_overlap: Chunk overlap of the calling parser
         
-        return chunks
+    Returns:
+        All chunks parsed from the file (picklable)
+    """
+    global _worker_parser
+    if _worker_parser is None or (_worker_parser.chunk_size, _worker_parser.chunk_overlap) != (chunk_size, chunk_overlap):
+        _worker_parser = DocumentParser(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    return list(_worker_parser.iter_chunks(Path(file_path)))
@@ -7,14 +7,40 @@ to avoid re-processing unchanged files during ingestion.
 
 import os
 import hashlib
+import mmap
 import pickle
+import sqlite3
 import threading
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional, Tuple
 import logging
 
+from .models import TrackerRecord
+
 logger = logging.getLogger(__name__)
 
+# Files at or above this size are hashed through a read-only memory map
+MMAP_HASH_THRESHOLD_BYTES = 128 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracker (
+    path TEXT PRIMARY KEY,
+    last_modified TEXT NOT NULL,
+    file_size INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    indexed_in_chroma INTEGER NOT NULL
+)
+"""
+
+_URL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS url_tracker (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT NOT NULL
+)
+"""
+
 
 class FileTracker:
     """Tracks file changes to enable incremental indexing."""
@@ -23,146 +49,330 @@ class FileTracker:
         """
         Initialize the file tracker.
         
+        Tracking data lives in a SQLite database, so lookups and updates touch
+        single rows instead of loading and rewriting the whole tracker.
+        
         Args:
-            tracker_path: Path to store the tracker data
+            tracker_path: Path to the tracker database
         """
         if tracker_path is None:
-            tracker_path = Path("./config/file_tracker.pkl")
+            tracker_path = Path("./config/file_tracker.db")
         
         self.tracker_path = tracker_path
-        self.file_data = self._load_tracker()
         self._lock = threading.Lock()  # Thread safety lock
+        self._conn = self._open_tracker()
     
-    def _load_tracker(self) -> Dict[str, Dict[str, Any]]:
-        """Load file tracking data from pickle file."""
-        if self.tracker_path.exists():
-            try:
-                with open(self.tracker_path, 'rb') as f:
-                    return pickle.load(f)
-            except Exception as e:
-                logger.warning(f"Error loading file tracker from {self.tracker_path}: {e}")
-        return {}
+    def _open_tracker(self) -> sqlite3.Connection:
+        """Open (creating if needed) the tracker database."""
+        self.tracker_path.parent.mkdir(parents=True, exist_ok=True)
+        is_new = not self.tracker_path.exists()
+        
+        # One connection shared by worker threads; access is serialized by self._lock
+        conn = sqlite3.connect(str(self.tracker_path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(_SCHEMA)
+        conn.execute(_URL_SCHEMA)
+        conn.commit()
+        
+        if is_new:
+            self._import_legacy_tracker(conn)
+        
+        return conn
     
-    def _save_tracker(self):
-        """Save file tracking data to pickle file."""
+    def _import_legacy_tracker(self, conn: sqlite3.Connection):
+        """Import entries from the previous pickle-based tracker, if present."""
+        legacy_path = self.tracker_path.with_suffix(".pkl")
+        if not legacy_path.exists():
+            return
+        
         try:
-            # Ensure directory exists
-            self.tracker_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(legacy_path, 'rb') as f:
+                legacy_data = pickle.load(f)
             
-            with self._lock:  # Thread-safe read
-                data_to_save = self.file_data.copy()  # Copy to avoid modification during save
-            
-            with open(self.tracker_path, 'wb') as f:
-                pickle.dump(data_to_save, f)
+            conn.executemany(
+                "INSERT OR REPLACE INTO tracker VALUES (?, ?, ?, ?, ?)",
+                (
+                    (
+                        path,
+                        info.get("last_modified", ""),
+                        info.get("file_size", 0),
+                        info.get("content_hash", ""),
+                        int(info.get("indexed_in_chroma", False))
+                    )
+                    for path, info in legacy_data.items()
+                )
+            )
+            conn.commit()
+            logger.info(f"Imported {len(legacy_data)} entries from legacy file tracker {legacy_path}")
         except Exception as e:
-            logger.error(f"Error saving file tracker to {self.tracker_path}: {e}")
+            logger.warning(f"Error importing legacy file tracker from {legacy_path}: {e}")
     
-    def should_reindex_file(self, file_path: Path, force_reindex: bool = False) -> bool:
+    def should_reindex_file(
+        self, 
+        file_path: Path, 
+        force_reindex: bool = False, 
+        stat_result: os.stat_result = None
+    ) -> bool:
         """
         Determine if a file should be re-indexed.
         
         Args:
             file_path: Path to the file
             force_reindex: If True, always reindex
+            stat_result: Stat already collected for the file (stats it if omitted)
             
         Returns:
             True if file should be reindexed
         """
+        return self.check_file(file_path, force_reindex, stat_result)[0]
+    
+    def check_file(
+        self, 
+        file_path: Path, 
+        force_reindex: bool = False, 
+        stat_result: os.stat_result = None
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Determine if a file should be re-indexed, keeping any hash computed on the way.
+        
+        Args:
+            file_path: Path to the file
+            force_reindex: If True, always reindex
+            stat_result: Stat already collected for the file (stats it if omitted)
+            
+        Returns:
+            (should reindex, content hash) where the hash is set when the
+            check had to hash the file, so build_record can reuse it
+        """
         if force_reindex:
-            return True
+            return True, None
             
         try:
             # Get current file stats
-            stat = file_path.stat()
+            stat = stat_result if stat_result is not None else file_path.stat()
             current_modified = str(stat.st_mtime)
             current_size = stat.st_size
             
-            # Check if file exists in tracker (thread-safe read)
-            file_key = str(file_path)
-            with self._lock:
-                if file_key not in self.file_data:
-                    logger.debug(f"File not in tracker, will index: {file_path}")
-                    return True
-                
-                tracked_info = self.file_data[file_key]
+            # Check if file exists in tracker
+            tracked_info = self.get_file_info(file_path)
+            if tracked_info is None:
+                logger.debug(f"File not in tracker, will index: {file_path}")
+                return True, None
             
-            # Check if modification time changed
-            if tracked_info.get("last_modified") != current_modified:
-                logger.debug(f"File modified, will reindex: {file_path}")
-                return True
+            # Check if file is already indexed in Chroma
+            if not tracked_info.get("indexed_in_chroma", False):
+                logger.debug(f"File not indexed in Chroma, will index: {file_path}")
+                return True, None
             
             # Check if file size changed significantly (indicates content change)
             tracked_size = tracked_info.get("file_size", 0)
             if abs(current_size - tracked_size) > 100:  # 100 byte threshold
                 logger.debug(f"File size changed, will reindex: {file_path}")
-                return True
+                return True, None
             
-            # Check if file is already indexed in Chroma
-            if not tracked_info.get("indexed_in_chroma", False):
-                logger.debug(f"File not indexed in Chroma, will index: {file_path}")
-                return True
+            if tracked_info.get("last_modified") == current_modified:
+                logger.debug(f"File unchanged, skipping: {file_path}")
+                return False, None
             
-            logger.debug(f"File unchanged, skipping: {file_path}")
-            return False
+            # Modification time changed; a touched-but-identical file (git checkout,
+            # touch) keeps its hash, so only the stored mtime needs refreshing
+            tracked_hash = tracked_info.get("content_hash")
+            if current_size == tracked_size and tracked_hash:
+                content_hash = self.calculate_file_hash(file_path, current_size)
+                if content_hash == tracked_hash:
+                    with self._lock:
+                        self._conn.execute(
+                            "UPDATE tracker SET last_modified = ? WHERE path = ?",
+                            (current_modified, str(file_path))
+                        )
+                        self._conn.commit()
+                    logger.debug(f"File touched but content unchanged, skipping: {file_path}")
+                    return False, content_hash
+                
+                logger.debug(f"File modified, will reindex: {file_path}")
+                return True, content_hash or None
+            
+            logger.debug(f"File modified, will reindex: {file_path}")
+            return True, None
             
         except Exception as e:
             logger.warning(f"Error checking file status, will index: {file_path} - {e}")
-            return True
+            return True, None
     
-    def calculate_file_hash(self, file_path: Path) -> str:
-        """Calculate a hash of the file content for change detection."""
+    def calculate_file_hash(self, file_path: Path, file_size: int = None) -> str:
+        """
+        Calculate a hash of the file content for change detection.
+        
+        The hash is only used to detect changes, so BLAKE2b (faster than MD5
+        in hashlib) is used. Large files are hashed over a memory map instead
+        of being read into a bytes object first.
+        
+        Args:
+            file_path: Path to the file
+            file_size: Size from a stat already taken (fstats the open file if omitted)
+            
+        Returns:
+            Hex digest of the file content, or "" on error
+        """
         try:
             with open(file_path, 'rb') as f:
-                content = f.read()
-                return hashlib.md5(content).hexdigest()
+                if file_size is None:
+                    file_size = os.fstat(f.fileno()).st_size
+                
+                if file_size < MMAP_HASH_THRESHOLD_BYTES:
+                    return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+                
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return hashlib.blake2b(mm, digest_size=16).hexdigest()
         except Exception as e:
             logger.warning(f"Error calculating file hash for {file_path}: {e}")
             return ""
     
-    def update_file_tracker(self, file_path: Path, indexed_in_chroma: bool = True):
-        """Update the file tracker with current file information."""
-        try:
-            stat = file_path.stat()
-            content_hash = self.calculate_file_hash(file_path)
-            
-            with self._lock:  # Thread-safe update
-                self.file_data[str(file_path)] = {
-                    "content_hash": content_hash,
-                    "last_modified": str(stat.st_mtime),
-                    "file_size": stat.st_size,
-                    "indexed_in_chroma": indexed_in_chroma
-                }
+    def build_record(
+        self, 
+        file_path: Path, 
+        indexed_in_chroma: bool = True, 
+        stat_result: os.stat_result = None,
+        content_hash: str = None
+    ) -> TrackerRecord:
+        """
+        Build a tracker record for a file without writing it.
+        
+        Args:
+            file_path: Path to the file
+            indexed_in_chroma: Whether the file's chunks were stored
+            stat_result: Stat taken when the file was scanned (stats it if omitted)
+            content_hash: Hash already computed by check_file (hashes the file if omitted)
             
-            self._save_tracker()
+        Returns:
+            TrackerRecord with the file's current mtime, size and content hash
+        """
+        stat = stat_result if stat_result is not None else file_path.stat()
+        return TrackerRecord(
+            path=str(file_path),
+            last_modified=str(stat.st_mtime),
+            file_size=stat.st_size,
+            content_hash=content_hash or self.calculate_file_hash(file_path, stat.st_size),
+            indexed_in_chroma=indexed_in_chroma
+        )
+    
+    def bulk_update(self, records: Iterable[TrackerRecord]) -> int:
+        """
+        Write many tracker records in a single transaction.
+        
+        Args:
+            records: Records to insert or replace
             
+        Returns:
+            Number of records written
+        """
+        rows = [
+            (r.path, r.last_modified, r.file_size, r.content_hash, int(r.indexed_in_chroma))
+            for r in records
+        ]
+        if not rows:
+            return 0
+        
+        try:
+            with self._lock:  # Thread-safe update
+                with self._conn:  # One transaction, one commit
+                    self._conn.executemany("INSERT OR REPLACE INTO tracker VALUES (?, ?, ?, ?, ?)", rows)
+            return len(rows)
         except Exception as e:
-            logger.warning(f"Error updating file tracker for {file_path}: {e}")
+            logger.error(f"Error bulk updating file tracker: {e}")
+            return 0
     
-    def mark_file_indexed(self, file_path: Path):
-        """Mark a file as successfully indexed in Chroma DB."""
-        file_key = str(file_path)
-        with self._lock:  # Thread-safe update
-            if file_key in self.file_data:
-                self.file_data[file_key]["indexed_in_chroma"] = True
-        self._save_tracker()
+    def update_file_tracker(
+        self, 
+        file_path: Path, 
+        indexed_in_chroma: bool = True, 
+        stat_result: os.stat_result = None,
+        content_hash: str = None
+    ):
+        """
+        Update the file tracker with current file information.
+        
+        Args:
+            file_path: Path to the file
+            indexed_in_chroma: Whether the file's chunks were stored
+            stat_result: Stat taken when the file was scanned (stats it if omitted)
+            content_hash: Hash already computed by check_file (hashes the file if omitted)
+        """
+        try:
+            self.bulk_update([self.build_record(file_path, indexed_in_chroma, stat_result, content_hash)])
+        except Exception as e:
+            logger.warning(f"Error updating file tracker for {file_path}: {e}")
     
     def get_file_info(self, file_path: Path) -> Optional[Dict[str, Any]]:
         """Get tracking information for a specific file."""
         with self._lock:  # Thread-safe read
-            return self.file_data.get(str(file_path))
+            row = self._conn.execute(
+                "SELECT last_modified, file_size, content_hash, indexed_in_chroma FROM tracker WHERE path = ?",
+                (str(file_path),)
+            ).fetchone()
+        
+        if row is None:
+            return None
+        
+        return {
+            "content_hash": row[2],
+            "last_modified": row[0],
+            "file_size": row[1],
+            "indexed_in_chroma": bool(row[3])
+        }
+    
+    def get_url_info(self, url: str) -> Optional[Dict[str, Any]]:
+        """Get the HTTP validators and body hash recorded for a URL."""
+        with self._lock:  # Thread-safe read
+            row = self._conn.execute(
+                "SELECT etag, last_modified, content_hash FROM url_tracker WHERE url = ?",
+                (url,)
+            ).fetchone()
+        
+        if row is None:
+            return None
+        
+        return {
+            "etag": row[0],
+            "last_modified": row[1],
+            "content_hash": row[2]
+        }
+    
+    def update_url_info(self, url: str, etag: Optional[str], last_modified: Optional[str], content_hash: str):
+        """
+        Record the HTTP validators and body hash of a fetched URL.
+        
+        Args:
+            url: URL that was fetched
+            etag: ETag response header, if any
+            last_modified: Last-Modified response header, if any
+            content_hash: Hash of the response body
+        """
+        try:
+            with self._lock:  # Thread-safe update
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO url_tracker VALUES (?, ?, ?, ?)",
+                        (url, etag, last_modified, content_hash)
+                    )
+        except Exception as e:
+            logger.warning(f"Error updating URL tracker for {url}: {e}")
     
     def clear_tracker(self):
-        """Clear all file tracking data."""
+        """Clear all file and URL tracking data."""
         with self._lock:  # Thread-safe update
-            self.file_data = {}
-        self._save_tracker()
+            self._conn.execute("DELETE FROM tracker")
+            self._conn.execute("DELETE FROM url_tracker")
+            self._conn.commit()
         logger.info("File tracker cleared")
     
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about tracked files."""
         with self._lock:  # Thread-safe read
-            total_files = len(self.file_data)
-            indexed_files = sum(1 for info in self.file_data.values() if info.get("indexed_in_chroma", False))
+            total_files, indexed_files = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(indexed_in_chroma), 0) FROM tracker"
+            ).fetchone()
         
         return {
             "total_tracked_files": total_files,
@@ -0,0 +1,104 @@
+"""
+Ingestion Models - Data structures shared by the ingestion pipeline.
+
+This module defines the dataclasses used to pass parsed document data
+between the parser, the storage layer, and the ingestion engine.
+"""
+
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class FileMetadata:
+    """File-level metadata shared by every chunk parsed from the same file."""
+    file_path: str
+    file_name: str
+    file_type: str
+
+    @classmethod
+    def from_path(cls, file_path: Path, file_type: str = None) -> "FileMetadata":
+        """
+        Build file metadata once for a file.
+
+        Args:
+            file_path: Path to the source file
+            file_type: Explicit file type (defaults to the file extension)
+
+        Returns:
+            FileMetadata with interned string fields
+        """
+        if file_type is None:
+            file_type = file_path.suffix[1:] if file_path.suffix else "unknown"
+        return cls(
+            file_path=sys.intern(str(file_path)),
+            file_name=sys.intern(file_path.name),
+            file_type=sys.intern(file_type)
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the file-level fields as a new flat metadata dictionary."""
+        return {
+            "file_path": self.file_path,
+            "file_name": self.file_name,
+            "file_type": self.file_type
+        }
+
+
+@dataclass(slots=True)
+class ChunkBatch:
+    """Chunks laid out as the parallel ID/document/metadata lists Chroma expects."""
+    ids: List[str] = field(default_factory=list)
+    documents: List[str] = field(default_factory=list)
+    metadatas: List[Dict[str, Any]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def append(self, chunk_id: str, document: str, metadata: Dict[str, Any]):
+        """Append a single chunk to the batch."""
+        self.ids.append(chunk_id)
+        self.documents.append(document)
+        self.metadatas.append(metadata)
+
+    def extend(self, other: "ChunkBatch"):
+        """Append every chunk from another batch."""
+        self.ids.extend(other.ids)
+        self.documents.extend(other.documents)
+        self.metadatas.extend(other.metadatas)
+
+
+@dataclass(frozen=True, slots=True)
+class TrackerRecord:
+    """One file's row in the file tracker."""
+    path: str
+    last_modified: str
+    file_size: int
+    content_hash: str
+    indexed_in_chroma: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class FetchedUrl:
+    """A fetched URL's text with the validators to record once it is ingested."""
+    url: str
+    text: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class AutoSource:
+    """Configuration for a source added by project auto-discovery."""
+    id: str
+    name: str
+    project_description: str
+    enabled: bool = True
+
+    @property
+    def description(self) -> str:
+        """Human-readable description, formatted only when read."""
+        return f"Auto-discovered project: {self.project_description}"
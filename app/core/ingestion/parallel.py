@@ -6,77 +6,152 @@ to speed up the ingestion process by processing multiple files simultaneously.
 """
 
 import concurrent.futures
+import os
+from itertools import chain
 from pathlib import Path
-from typing import List, Dict, Any, Callable, Optional
+from typing import Dict, Any, Callable, Iterable, Optional, Tuple, Union
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Pending file tasks allowed per worker before submission waits for completions
+PENDING_TASKS_PER_WORKER = 2
+
+# A file to process: its path, or a (path, stat result) pair from a directory scan
+FileItem = Union[Path, Tuple[Path, os.stat_result]]
+
+
+def _item_path(item: FileItem) -> Path:
+    """Return the path of a file item."""
+    return item[0] if isinstance(item, tuple) else item
+
+
+def default_worker_count() -> int:
+    """
+    Worker count for I/O-bound file processing.
+    
+    Uses the INGEST_WORKERS environment variable when set, otherwise twice
+    the CPU count capped at 32.
+    """
+    configured = os.environ.get("INGEST_WORKERS")
+    if configured:
+        try:
+            return max(1, int(configured))
+        except ValueError:
+            logger.warning(f"Ignoring invalid INGEST_WORKERS value: {configured}")
+    return min(32, (os.cpu_count() or 1) * 2)
+
+
+def default_parse_process_count() -> int:
+    """
+    Number of worker processes used to parse files, or 0 to parse in threads.
+    
+    Parsing is pure Python and holds the GIL, so it only scales across cores
+    in separate processes. This is opt-in through the INGEST_PARSE_PROCESSES
+    environment variable ("auto" uses the CPU count), since each worker
+    process re-imports the application on start.
+    """
+    configured = os.environ.get("INGEST_PARSE_PROCESSES")
+    if not configured:
+        return 0
+    if configured == "auto":
+        return os.cpu_count() or 1
+    try:
+        return max(0, int(configured))
+    except ValueError:
+        logger.warning(f"Ignoring invalid INGEST_PARSE_PROCESSES value: {configured}")
+        return 0
+
 
 class ParallelProcessor:
     """Handles parallel processing of files during ingestion."""
     
-    def __init__(self, max_workers: int = 4):
+    def __init__(self, max_workers: int = None):
         """
         Initialize the parallel processor.
         
         Args:
-            max_workers: Maximum number of concurrent workers
+            max_workers: Maximum number of concurrent workers (defaults to
+                default_worker_count())
         """
-        self.max_workers = max_workers
+        self.max_workers = max_workers or default_worker_count()
     
     def process_files_parallel(
         self, 
-        files: List[Path], 
-        process_func: Callable[[Path, Any], Optional[Dict[str, Any]]],
+        files: Iterable[FileItem], 
+        process_func: Callable[[FileItem, Any], Optional[Dict[str, Any]]],
         source_path: Path,
+        max_workers: int = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
         Process multiple files in parallel for better performance.
         
+        Files are pulled from the iterable only as workers free up, so a
+        generator (e.g. a directory scan still in progress) is consumed
+        concurrently with processing.
+        
         Args:
-            files: List of file paths to process
+            files: File paths, or (path, stat result) pairs, to process (any
+                iterable, consumed once); each item is passed to process_func as-is
             process_func: Function to process each file
             source_path: Source directory path
+            max_workers: Worker threads for this call (defaults to self.max_workers)
             **kwargs: Additional arguments to pass to process_func
             
         Returns:
             Dictionary with processing statistics
         """
-        if not files:
+        file_iter = iter(files)
+        first_file = next(file_iter, None)
+        if first_file is None:
             return {"files_processed": 0, "chunks_created": 0}
+        file_iter = chain([first_file], file_iter)
+        max_workers = max_workers or self.max_workers
+        
+        processed_files = 0
+        total_chunks = 0
+        errors = []
+        pending = {}
+        
+        def collect(future: concurrent.futures.Future):
+            """Fold one finished future into the running statistics."""
+            nonlocal processed_files, total_chunks
+            file_path = pending.pop(future)
+            try:
+                result = future.result()
+                if result:
+                    processed_files += 1
+                    total_chunks += result.get("chunks_created", 0)
+                    logger.debug(f"Processed file: {file_path}")
+                else:
+                    logger.debug(f"No result from processing: {file_path}")
+            except Exception as e:
+                error_msg = f"Error processing file {file_path}: {e}"
+                logger.error(error_msg)
+                errors.append(error_msg)
         
         try:
-            logger.info(f"Processing {len(files)} files with {self.max_workers} workers")
+            logger.info(f"Processing files with {max_workers} workers")
             
-            # Use ThreadPoolExecutor for I/O-bound operations
-            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                # Submit all file processing tasks
-                future_to_file = {
-                    executor.submit(process_func, file_path, source_path, **kwargs): file_path 
-                    for file_path in files
-                }
-                
-                # Collect results as they complete
-                processed_files = 0
-                total_chunks = 0
-                errors = []
-                
-                for future in concurrent.futures.as_completed(future_to_file):
-                    file_path = future_to_file[future]
-                    try:
-                        result = future.result()
-                        if result:
-                            processed_files += 1
-                            total_chunks += result.get("chunks_created", 0)
-                            logger.debug(f"Processed file: {file_path}")
-                        else:
-                            logger.debug(f"No result from processing: {file_path}")
-                    except Exception as e:
-                        error_msg = f"Error processing file {file_path}: {e}"
-                        logger.error(error_msg)
-                        errors.append(error_msg)
+            # Use ThreadPoolExecutor for I/O-bound operations, keeping only a
+            # bounded number of futures alive instead of one per file
+            max_pending = max_workers * PENDING_TASKS_PER_WORKER
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                while True:
+                    # Top up the pending set
+                    for item in file_iter:
+                        pending[executor.submit(process_func, item, source_path, **kwargs)] = _item_path(item)
+                        if len(pending) >= max_pending:
+                            break
+                    
+                    if not pending:
+                        break
+                    
+                    # Drain whatever has finished
+                    done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        collect(future)
                 
                 # Log summary
                 if errors:
@@ -92,13 +167,24 @@ class ParallelProcessor:
                 
         except Exception as e:
             logger.error(f"Error in parallel file processing: {e}")
-            # Fallback to sequential processing
-            return self._process_files_sequential(files, process_func, source_path, **kwargs)
+            
+            # Leaving the executor waited for the submitted files; count them
+            for future in list(pending):
+                collect(future)
+            
+            # Fall back to sequential processing of the files not yet submitted,
+            # keeping the statistics gathered so far
+            fallback = self._process_files_sequential(file_iter, process_func, source_path, **kwargs)
+            return {
+                "files_processed": processed_files + fallback["files_processed"],
+                "chunks_created": total_chunks + fallback["chunks_created"],
+                "errors": errors + fallback["errors"]
+            }
     
     def _process_files_sequential(
         self, 
-        files: List[Path], 
-        process_func: Callable[[Path, Any], Optional[Dict[str, Any]]],
+        files: Iterable[FileItem], 
+        process_func: Callable[[FileItem, Any], Optional[Dict[str, Any]]],
         source_path: Path,
         **kwargs
     ) -> Dict[str, Any]:
@@ -109,9 +195,10 @@ class ParallelProcessor:
         total_chunks = 0
         errors = []
         
-        for file_path in files:
+        for item in files:
+            file_path = _item_path(item)
             try:
-                result = process_func(file_path, source_path, **kwargs)
+                result = process_func(item, source_path, **kwargs)
                 if result:
                     processed_files += 1
                     total_chunks += result.get("chunks_created", 0)
@@ -33,12 +33,8 @@ class DocumentRetriever:
         )
         
         # Get or create the main collection
-        try:
-            self.collection = self.chroma_client.get_collection("stackguide_docs")
-            logger.info("Connected to existing Chroma collection")
-        except Exception:
-            self.collection = self.chroma_client.create_collection("stackguide_docs")
-            logger.info("Created new Chroma collection")
+        self.collection = self.chroma_client.get_or_create_collection("stackguide_docs")
+        logger.info("Connected to Chroma collection")
     
     def retrieve_documents(self, query: SearchQuery) -> List[SearchResult]:
         """
@@ -121,17 +117,17 @@ class DocumentRetriever:
             List of matching search results
         """
         try:
-            results = self.collection.query(
-                query_texts=[""],  # Empty query, just filter by metadata
-                n_results=max_results,
+            # Pure metadata lookup - no query embedding or vector search needed
+            results = self.collection.get(
                 where=filters,
+                limit=max_results,
                 include=["documents", "metadatas"]
             )
             
             search_results = []
-            if results["documents"] and results["documents"][0]:
-                documents = results["documents"][0]
-                metadatas = results["metadatas"][0]
+            if results["documents"]:
+                documents = results["documents"]
+                metadatas = results["metadatas"] or [None] * len(documents)
                 
                 for i, (doc, metadata) in enumerate(zip(documents, metadatas)):
                     search_result = SearchResult(
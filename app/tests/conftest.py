@@ -0,0 +1,9 @@
+"""Pytest configuration: make the application packages importable from any working directory."""
+
+import sys
+from pathlib import Path
+
+# The application is imported as top-level packages (core, api, ...) from app/
+APP_DIR = Path(__file__).resolve().parent.parent
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
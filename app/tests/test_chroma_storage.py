@@ -0,0 +1,40 @@
+"""Tests for ChromaStorage client selection."""
+
+import pytest
+
+# The ingestion package imports the Chroma client at module level
+pytest.importorskip("chromadb")
+
+from core.ingestion import engine as engine_module
+from core.ingestion.chroma_storage import ChromaStorage, default_persist_path
+
+
+def test_default_persist_path_is_opt_in(monkeypatch, tmp_path):
+    monkeypatch.delenv("CHROMA_PERSIST_PATH", raising=False)
+    assert default_persist_path() is None
+
+    monkeypatch.setenv("CHROMA_PERSIST_PATH", str(tmp_path))
+    assert default_persist_path() == str(tmp_path)
+
+
+def test_persist_path_uses_local_client(tmp_path):
+    storage = ChromaStorage(persist_path=str(tmp_path / "chroma"))
+
+    assert storage.collection.count() == 0
+    assert (tmp_path / "chroma").is_dir()
+
+
+def test_engine_passes_persist_path(monkeypatch, tmp_path):
+    created = []
+
+    class RecordingStorage:
+        def __init__(self, *args, **kwargs):
+            created.append(kwargs)
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("CHROMA_PERSIST_PATH", str(tmp_path / "chroma"))
+    monkeypatch.setattr(engine_module, "ChromaStorage", RecordingStorage)
+
+    engine_module.IngestionEngine(config_path=str(tmp_path / "config.json"))
+
+    assert created == [{"persist_path": str(tmp_path / "chroma")}]
@@ -0,0 +1,58 @@
+"""Tests for ChunkBuffer batching and failed-batch tracking."""
+
+from pathlib import Path
+
+import pytest
+
+# The ingestion package imports the Chroma client at module level
+pytest.importorskip("chromadb")
+
+from core.ingestion.chroma_storage import ChromaStorage, ChunkBuffer
+from core.ingestion.document_parser import DocumentParser
+
+
+class FakeStorage(ChromaStorage):
+    """ChromaStorage that records batches instead of connecting to Chroma."""
+
+    def __init__(self, failing_paths=()):
+        self.failing_paths = set(failing_paths)
+        self.batches = []
+
+    def add_batch(self, batch):
+        if any(metadata["file_path"] in self.failing_paths for metadata in batch.metadatas):
+            return 0
+        self.batches.append(batch)
+        return len(batch)
+
+
+def _chunks(tmp_path: Path, name: str, text: str):
+    file_path = tmp_path / name
+    file_path.write_text(text, encoding="utf-8")
+    return list(DocumentParser(chunk_size=100, chunk_overlap=0).parse_file(file_path))
+
+
+def test_chunk_buffer_stores_batches(tmp_path):
+    storage = FakeStorage()
+    buffer = ChunkBuffer(storage, batch_size=2)
+
+    chunks = _chunks(tmp_path, "a.txt", "word " * 100)
+    buffer.add(chunks, "docs")
+
+    assert buffer.flush() == len(chunks)
+    assert not buffer.failed_files
+    metadatas = [m for batch in storage.batches for m in batch.metadatas]
+    assert [m["chunk_index"] for m in metadatas] == list(range(len(chunks)))
+    assert all(m["source_name"] == "docs" for m in metadatas)
+
+
+def test_chunk_buffer_records_failed_files(tmp_path):
+    good = _chunks(tmp_path, "good.txt", "good text")
+    bad = _chunks(tmp_path, "bad.txt", "bad text")
+    storage = FakeStorage(failing_paths={str(tmp_path / "bad.txt")})
+    buffer = ChunkBuffer(storage, batch_size=1)
+
+    buffer.add(good)
+    buffer.add(bad)
+
+    assert buffer.flush() == 1
+    assert buffer.failed_files == {str(tmp_path / "bad.txt")}
@@ -0,0 +1,68 @@
+"""Tests for ProjectDiscovery and its mtime-validated cache."""
+
+import os
+
+import pytest
+
+# The ingestion package imports the Chroma client at module level
+pytest.importorskip("chromadb")
+
+from core.ingestion.discovery import ProjectDiscovery
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / "projects"
+    (root / "app").mkdir(parents=True)
+    (root / "app" / "README.md").write_text("# App\nFirst line\n", encoding="utf-8")
+    (root / "app" / "package.json").write_text("{}", encoding="utf-8")
+    (root / "lib").mkdir()
+    (root / "lib" / "pyproject.toml").write_text("", encoding="utf-8")
+    (root / "notes").mkdir()
+    return root
+
+
+def _describe(discovery: ProjectDiscovery, root):
+    projects = discovery._discover_projects_in_directory(str(root))
+    return sorted((p["name"], p["description"], p["project_type"]) for p in projects)
+
+
+def test_discovers_projects(root):
+    assert _describe(ProjectDiscovery(), root) == [
+        ("app", "First line", "Node.js"),
+        ("lib", "Project with pyproject.toml", "Unknown")
+    ]
+
+
+def test_warm_refresh_only_stats(root, tmp_path, monkeypatch):
+    cache_path = tmp_path / "discovery_cache.json"
+    discovery = ProjectDiscovery(cache_path)
+    expected = _describe(discovery, root)
+    discovery._save_cache()
+
+    stats, listings = [], []
+    real_stat, real_scandir = os.stat, os.scandir
+    monkeypatch.setattr(os, "stat", lambda path, *args, **kwargs: stats.append(path) or real_stat(path, *args, **kwargs))
+    monkeypatch.setattr(os, "scandir", lambda *args: listings.append(args) or real_scandir(*args))
+
+    assert _describe(ProjectDiscovery(cache_path), root) == expected
+
+    # One stat for the root, one per candidate and one per project README
+    assert not listings
+    assert len([path for path in stats if str(path).startswith(str(root))]) == 1 + 3 + 1
+
+
+def test_readme_edit_is_picked_up_across_instances(root, tmp_path):
+    cache_path = tmp_path / "discovery_cache.json"
+    discovery = ProjectDiscovery(cache_path)
+    _describe(discovery, root)
+    discovery._save_cache()
+    readme = root / "app" / "README.md"
+    directory_mtime = os.stat(root / "app").st_mtime_ns
+    readme_stat = readme.stat()
+
+    readme.write_text("# App\nEdited line\n", encoding="utf-8")
+    os.utime(readme, ns=(readme_stat.st_atime_ns, readme_stat.st_mtime_ns + 10**9))
+
+    assert os.stat(root / "app").st_mtime_ns == directory_mtime
+    assert ("app", "Edited line", "Node.js") in _describe(ProjectDiscovery(cache_path), root)
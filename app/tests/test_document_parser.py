@@ -0,0 +1,94 @@
+"""Tests for DocumentParser chunking."""
+
+import json
+
+import pytest
+
+# The ingestion package imports the Chroma client at module level
+pytest.importorskip("chromadb")
+
+from core.ingestion import document_parser
+from core.ingestion.document_parser import DocumentParser
+
+
+STREAM_TEXT = "".join(
+    f"Line {i}: ünïcödé ✓ text. Another sentence here!\r\n" + ("\n" if i % 7 == 0 else "")
+    for i in range(400)
+)
+
+
+def _without_total_length(chunk):
+    metadata = {key: value for key, value in chunk["metadata"].items() if key != "total_length"}
+    return {**chunk, "metadata": metadata}
+
+
+@pytest.mark.parametrize("chunk_size, chunk_overlap", [(200, 0), (333, 50), (1000, 100)])
+@pytest.mark.parametrize("block_bytes", [1, 7, 4096])
+def test_streaming_chunker_matches_in_memory(tmp_path, monkeypatch, chunk_size, chunk_overlap, block_bytes):
+    file_path = tmp_path / "doc.txt"
+    file_path.write_bytes(STREAM_TEXT.encode("utf-8"))
+    parser = DocumentParser(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+    in_memory = list(parser.iter_chunks(file_path))
+
+    # Force the streaming path, with blocks that split multi-byte characters and CRLFs
+    monkeypatch.setattr(document_parser, "STREAM_THRESHOLD_BYTES", 0)
+    monkeypatch.setattr(document_parser, "STREAM_BLOCK_BYTES", block_bytes)
+    streamed = list(parser.iter_chunks(file_path))
+
+    # total_length is the only difference: the streaming path reports the byte size
+    assert len(in_memory) > 1
+    assert [_without_total_length(chunk) for chunk in streamed] == [_without_total_length(chunk) for chunk in in_memory]
+    assert {chunk["metadata"]["total_length"] for chunk in streamed} == {file_path.stat().st_size}
+
+
+def test_streaming_decode_error_propagates(tmp_path, monkeypatch):
+    file_path = tmp_path / "doc.txt"
+    file_path.write_bytes(STREAM_TEXT.encode("utf-8") + b"\xff")
+    parser = DocumentParser(chunk_size=200, chunk_overlap=0)
+    monkeypatch.setattr(document_parser, "STREAM_THRESHOLD_BYTES", 0)
+    monkeypatch.setattr(document_parser, "STREAM_BLOCK_BYTES", 1024)
+
+    chunks = parser.iter_chunks(file_path)
+    # Earlier chunks are yielded before the error surfaces
+    assert next(chunks)["content"]
+    with pytest.raises(UnicodeDecodeError):
+        list(chunks)
+
+    # parse_file logs the error instead of raising
+    assert len(list(parser.parse_file(file_path))) > 1
+
+
+@pytest.mark.parametrize("chunk_size, chunk_overlap", [(200, 0), (200, 150), (1000, 990), (100, 100)])
+def test_chunks_cover_text_with_a_minimum_step(chunk_size, chunk_overlap):
+    parser = DocumentParser(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    text = STREAM_TEXT.replace("\r\n", "\n")
+    file_meta = document_parser.FileMetadata.from_path(document_parser.Path("doc.txt"))
+
+    spans = [
+        (chunk["metadata"]["chunk_start"], chunk["metadata"]["chunk_end"])
+        for chunk in parser._create_chunks(text, file_meta, "Text Document")
+    ]
+
+    min_step = max(1, chunk_size - chunk_overlap)
+    assert spans[0][0] == 0 and spans[-1][1] >= len(text)
+    for (start, end), (next_start, _) in zip(spans, spans[1:]):
+        # No text is skipped, and each chunk starts a full step later unless
+        # the previous one was cut shorter than that
+        assert next_start <= end
+        assert next_start - start >= min(min_step, end - start)
+
+
+def test_json_is_validated_and_chunked_as_source_text(tmp_path):
+    parser = DocumentParser(chunk_size=200, chunk_overlap=0)
+    valid = tmp_path / "valid.json"
+    valid.write_text('{"name": "service",\n "ports": [80, 443]}', encoding="utf-8")
+    invalid = tmp_path / "invalid.json"
+    invalid.write_text('{"name": "service",', encoding="utf-8")
+
+    # Valid JSON keeps its original formatting
+    assert [chunk["content"] for chunk in parser.iter_chunks(valid)] == [valid.read_text(encoding="utf-8")]
+
+    with pytest.raises(json.JSONDecodeError):
+        list(parser.iter_chunks(invalid))
+    assert list(parser.parse_file(invalid)) == []
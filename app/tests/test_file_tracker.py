@@ -0,0 +1,121 @@
+"""Tests for the SQLite-backed file tracker."""
+
+import os
+import pickle
+from pathlib import Path
+
+import pytest
+
+# The ingestion package imports the Chroma client at module level
+pytest.importorskip("chromadb")
+
+from core.ingestion.file_tracker import FileTracker
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    return FileTracker(tmp_path / "file_tracker.db")
+
+
+def _write(path: Path, text: str) -> Path:
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_tracker_skips_unchanged_file(tracker, tmp_path):
+    file_path = _write(tmp_path / "a.txt", "hello world")
+
+    assert tracker.should_reindex_file(file_path)
+
+    tracker.update_file_tracker(file_path)
+    assert not tracker.should_reindex_file(file_path)
+    assert tracker.should_reindex_file(file_path, force_reindex=True)
+
+
+def test_tracker_persists_across_instances(tmp_path):
+    file_path = _write(tmp_path / "a.txt", "hello world")
+    FileTracker(tmp_path / "file_tracker.db").update_file_tracker(file_path)
+
+    tracker = FileTracker(tmp_path / "file_tracker.db")
+
+    assert not tracker.should_reindex_file(file_path)
+
+
+def test_tracker_touched_file_keeps_hash(tracker, tmp_path):
+    file_path = _write(tmp_path / "a.txt", "hello world")
+    tracker.update_file_tracker(file_path)
+    stat = file_path.stat()
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    should_reindex, content_hash = tracker.check_file(file_path)
+
+    assert not should_reindex
+    assert content_hash == tracker.calculate_file_hash(file_path)
+    # The refreshed mtime makes the next check a plain stat comparison
+    assert tracker.check_file(file_path) == (False, None)
+
+
+def test_tracker_returns_triage_hash_for_changed_file(tracker, tmp_path, monkeypatch):
+    file_path = _write(tmp_path / "a.txt", "hello world")
+    tracker.update_file_tracker(file_path)
+    stat = file_path.stat()
+    _write(file_path, "HELLO WORLD")
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    should_reindex, content_hash = tracker.check_file(file_path)
+
+    assert should_reindex
+    assert content_hash == tracker.calculate_file_hash(file_path)
+    # The record reuses the triage hash instead of hashing the file again
+    monkeypatch.setattr(tracker, "calculate_file_hash", lambda *args: pytest.fail("file hashed twice"))
+    assert tracker.build_record(file_path, content_hash=content_hash).content_hash == content_hash
+
+
+def test_tracker_bulk_update(tracker, tmp_path):
+    files = [_write(tmp_path / f"{i}.txt", f"file {i}") for i in range(3)]
+
+    written = tracker.bulk_update(tracker.build_record(file_path) for file_path in files)
+
+    assert written == 3
+    assert tracker.bulk_update([]) == 0
+    assert tracker.get_stats()["total_tracked_files"] == 3
+    assert all(not tracker.should_reindex_file(file_path) for file_path in files)
+
+
+def test_tracker_bulk_update_records_pending_files(tracker, tmp_path):
+    file_path = _write(tmp_path / "a.txt", "hello")
+
+    tracker.bulk_update([tracker.build_record(file_path, indexed_in_chroma=False)])
+
+    assert tracker.get_file_info(file_path)["indexed_in_chroma"] is False
+    assert tracker.should_reindex_file(file_path)
+
+
+def test_tracker_imports_legacy_pickle(tmp_path):
+    legacy = {
+        "/docs/a.md": {
+            "last_modified": "1700000000.0",
+            "file_size": 42,
+            "content_hash": "abc",
+            "indexed_in_chroma": True
+        }
+    }
+    with open(tmp_path / "file_tracker.pkl", "wb") as f:
+        pickle.dump(legacy, f)
+
+    tracker = FileTracker(tmp_path / "file_tracker.db")
+
+    info = tracker.get_file_info(Path("/docs/a.md"))
+    assert info["content_hash"] == "abc"
+    assert info["file_size"] == 42
+    assert info["indexed_in_chroma"] is True
+
+
+def test_tracker_ignores_legacy_pickle_for_existing_database(tmp_path):
+    FileTracker(tmp_path / "file_tracker.db")
+    with open(tmp_path / "file_tracker.pkl", "wb") as f:
+        pickle.dump({"/docs/a.md": {"content_hash": "abc"}}, f)
+
+    tracker = FileTracker(tmp_path / "file_tracker.db")
+
+    assert tracker.get_file_info(Path("/docs/a.md")) is None
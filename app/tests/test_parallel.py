@@ -0,0 +1,55 @@
+"""Tests for ParallelProcessor."""
+
+from pathlib import Path
+
+import pytest
+
+# The ingestion package imports the Chroma client at module level
+pytest.importorskip("chromadb")
+
+from core.ingestion.parallel import ParallelProcessor
+
+
+class FlakyFiles:
+    """File iterator that fails once partway through, then carries on."""
+
+    def __init__(self, count: int, fail_at: int):
+        self.paths = iter(Path(f"{i}.txt") for i in range(count))
+        self.fail_at = fail_at
+        self.yielded = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.yielded == self.fail_at:
+            self.fail_at = None
+            raise RuntimeError("scan failed")
+        self.yielded += 1
+        return next(self.paths)
+
+
+def process(file_path, source_path):
+    if file_path.name == "3.txt":
+        raise ValueError("bad file")
+    return {"chunks_created": 2}
+
+
+def test_process_files_parallel_counts_every_file():
+    result = ParallelProcessor(max_workers=2).process_files_parallel(
+        (Path(f"{i}.txt") for i in range(10)), process, Path(".")
+    )
+
+    assert result["files_processed"] == 9
+    assert result["chunks_created"] == 18
+    assert len(result["errors"]) == 1
+
+
+def test_sequential_fallback_keeps_parallel_statistics():
+    result = ParallelProcessor(max_workers=2).process_files_parallel(
+        FlakyFiles(count=10, fail_at=6), process, Path(".")
+    )
+
+    assert result["files_processed"] == 9
+    assert result["chunks_created"] == 18
+    assert result["errors"] == ["Error processing file 3.txt: bad file"]
@@ -0,0 +1,62 @@
+"""Tests for the opt-in parse process pool."""
+
+import pytest
+
+# The ingestion package imports the Chroma client at module level
+pytest.importorskip("chromadb")
+
+from core.ingestion import engine as engine_module
+from core.ingestion.chroma_storage import ChromaStorage
+
+
+class FakeStorage(ChromaStorage):
+    """ChromaStorage that counts stored chunks instead of connecting to Chroma."""
+
+    def __init__(self, *args, **kwargs):
+        self.stored = 0
+
+    def add_batch(self, batch):
+        self.stored += len(batch)
+        return len(batch)
+
+
+@pytest.fixture
+def engine_factory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(engine_module, "ChromaStorage", FakeStorage)
+
+    def make_engine(parse_processes):
+        monkeypatch.setenv("INGEST_PARSE_PROCESSES", str(parse_processes))
+        return engine_module.IngestionEngine(config_path=str(tmp_path / "config.json"))
+
+    return make_engine
+
+
+def test_parse_pool_only_lives_for_the_block(engine_factory):
+    engine = engine_factory(2)
+
+    assert engine._parse_executor is None
+    with engine._parse_pool():
+        executor = engine._parse_executor
+        assert executor is not None
+    assert engine._parse_executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
+
+
+def test_parse_pool_matches_in_process_parsing(engine_factory, tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for i in range(4):
+        (docs / f"{i}.md").write_text(f"# Doc {i}\n\n" + "Some text. " * 200, encoding="utf-8")
+
+    in_process = engine_factory(0)
+    expected = in_process._ingest_local_directory(docs, force_reindex=True)
+
+    pooled = engine_factory(2)
+    with pooled._parse_pool():
+        result = pooled._ingest_local_directory(docs, force_reindex=True)
+
+    assert result["files_processed"] == expected["files_processed"] == 4
+    assert result["chunks_created"] == expected["chunks_created"]
+    assert pooled.chroma_storage.stored == in_process.chroma_storage.stored
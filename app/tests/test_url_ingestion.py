@@ -0,0 +1,126 @@
+"""Tests for URL ingestion change detection."""
+
+import pytest
+
+# The ingestion package imports the Chroma client at module level
+pytest.importorskip("chromadb")
+
+from core.ingestion import engine as engine_module
+
+
+class FakeStorage:
+    """Stand-in for ChromaStorage, so no Chroma server is needed."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+class FakeResponse:
+    """Streaming response stand-in for requests.Response."""
+
+    def __init__(self, body: str, status_code: int = 200, etag: str = None):
+        self.status_code = status_code
+        self.encoding = "utf-8"
+        self.headers = {"Content-Type": "text/html; charset=utf-8"}
+        if etag:
+            self.headers["ETag"] = etag
+        self._body = body.encode("utf-8")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        return (self._body[i:i + chunk_size] for i in range(0, len(self._body), chunk_size))
+
+
+class FakeSession:
+    """HTTP session serving fixed pages and honouring If-None-Match."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+
+    def get(self, url, timeout=None, stream=False, headers=None):
+        headers = headers or {}
+        self.requests.append((url, headers))
+        body, etag = self.pages[url]
+        if etag and headers.get("If-None-Match") == etag:
+            return FakeResponse("", status_code=304)
+        return FakeResponse(body, etag=etag)
+
+
+PAGE = "<html><body><p>Shared page text for the tests.</p></body></html>"
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("INGEST_PARSE_PROCESSES", raising=False)
+    monkeypatch.setattr(engine_module, "ChromaStorage", FakeStorage)
+    ingestion_engine = engine_module.IngestionEngine(config_path=str(tmp_path / "config.json"))
+    ingestion_engine.http_session = FakeSession({
+        "https://example.com/a": (PAGE, '"v1"'),
+        "https://example.com/b": (PAGE, None),
+        "https://example.com/c": ("<html><body><p>Other text</p></body></html>", None)
+    })
+    return ingestion_engine
+
+
+def test_url_conditional_get_reports_cached(engine):
+    first = engine.ingest_url("https://example.com/a")
+    second = engine.ingest_url("https://example.com/a")
+
+    assert first["success"] and first["chunks_created"] == 1
+    assert second["cached"] is True
+    assert engine.http_session.requests[-1][1] == {"If-None-Match": '"v1"'}
+
+
+def test_url_unchanged_body_reports_cached(engine):
+    engine.ingest_url("https://example.com/c")
+
+    assert engine.ingest_url("https://example.com/c")["cached"] is True
+
+
+def test_url_failed_extraction_is_refetched(engine):
+    engine._extract_text_from_html = lambda html_content: ""
+    failed = engine.ingest_url("https://example.com/a")
+    del engine._extract_text_from_html
+
+    assert not failed["success"]
+    assert engine.file_tracker.get_url_info("https://example.com/a") is None
+
+    retried = engine.ingest_url("https://example.com/a")
+
+    assert retried["success"] and retried["chunks_created"] == 1
+    assert "cached" not in retried
+    assert engine.http_session.requests[-1][1] == {}
+
+
+def test_url_duplicate_body_is_deduplicated(engine):
+    engine.ingest_url("https://example.com/a")
+
+    duplicate = engine.ingest_url("https://example.com/b")
+
+    assert duplicate["deduplicated_from"] == "https://example.com/a"
+    assert duplicate["chunks_created"] == 0
+    assert engine.ingest_url("https://example.com/c")["chunks_created"] == 1
+
+
+def test_url_failed_ingest_does_not_claim_body(engine):
+    def fail(html_content):
+        raise ValueError("extraction failed")
+
+    engine._extract_text_from_html = fail
+    assert not engine.ingest_url("https://example.com/a")["success"]
+    del engine._extract_text_from_html
+
+    result = engine.ingest_url("https://example.com/b")
+
+    assert result["success"] and result["chunks_created"] == 1
+    assert "deduplicated_from" not in result